@@ -6,14 +6,18 @@ TVL information, and other metrics from actual Mantle Network DeFi protocols.
 """
 
 import asyncio
+import copy
 import aiohttp
-import json
+import orjson
 import logging
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 import time
 
+from http_client import get_session, close_session
+
 logger = logging.getLogger(__name__)
 
 # ==============================================================================
@@ -43,6 +47,77 @@ class StrategyPerformance:
     slippage_estimate: float
     gas_cost_estimate: float
 
+# ==============================================================================
+# CONDITIONAL REQUESTS
+# ==============================================================================
+
+# Protocol endpoints fail fast so the fallback data kicks in before the gather stalls
+FAST_TIMEOUT = aiohttp.ClientTimeout(total=8, connect=2, sock_read=5)
+# CoinGecko is reliable but rate-limits under load, so it gets more read headroom
+PRICE_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=2, sock_read=8)
+
+# Transient statuses worth retrying before falling back to mock data
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 2.0
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Exponential backoff with jitter, honouring a numeric Retry-After header"""
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_MAX_DELAY)
+        except ValueError:
+            pass  # HTTP-date form - use the computed backoff
+    return min(RETRY_BASE_DELAY * 2 ** attempt + random.random() * 0.1, RETRY_MAX_DELAY)
+
+async def _conditional_get_json(session: aiohttp.ClientSession, url: str,
+                                validators: Dict[str, Dict],
+                                timeout: aiohttp.ClientTimeout = FAST_TIMEOUT) -> Tuple[int, Optional[Dict]]:
+    """
+    GET a JSON endpoint, revalidating with the ETag / Last-Modified of the previous response.
+    
+    `validators` maps URL -> {'etag', 'last_modified', 'body'} and is updated in place.
+    A 304 Not Modified returns the stored body with status 200. 429/5xx responses and
+    connection errors are retried with backoff; timeouts are not, so dead endpoints fail fast.
+    """
+    entry = validators.get(url)
+    headers = {}
+    if entry:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with session.get(url, headers=headers, timeout=timeout) as response:
+                if response.status not in RETRYABLE_STATUSES or attempt == MAX_RETRIES:
+                    return await _read_conditional_response(response, url, entry, validators)
+                delay = _retry_delay(attempt, response.headers.get('Retry-After'))
+                logger.warning(f"⏳ {url} returned {response.status}, retrying in {delay:.2f}s")
+        except aiohttp.ClientError as e:
+            if isinstance(e, asyncio.TimeoutError) or attempt == MAX_RETRIES:
+                raise
+            delay = _retry_delay(attempt)
+            logger.warning(f"⏳ {url} failed ({e}), retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+async def _read_conditional_response(response: aiohttp.ClientResponse, url: str, entry: Optional[Dict],
+                                     validators: Dict[str, Dict]) -> Tuple[int, Optional[Dict]]:
+    """Decode a conditional GET response and remember its validators"""
+    if response.status == 304 and entry:
+        return 200, entry['body']
+    if response.status != 200:
+        return response.status, None
+    
+    body = orjson.loads(await response.read())
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        validators[url] = {'etag': etag, 'last_modified': last_modified, 'body': body}
+    return 200, body
+
 # ==============================================================================
 # INIT CAPITAL API INTEGRATION
 # ==============================================================================
@@ -50,17 +125,22 @@ class StrategyPerformance:
 class InitCapitalAPI:
     """API integration for INIT Capital on Mantle Network"""
     
-    def __init__(self):
+    # Fallback data when API is unavailable (shared template - callers get deep copies)
+    _FALLBACK_DATA = {
+        'markets': [
+            {'symbol': 'cmETH', 'supplyAPY': 0.042, 'borrowAPY': 0.035, 'tvl': 5000000},
+            {'symbol': 'USDT', 'supplyAPY': 0.028, 'borrowAPY': 0.068, 'tvl': 8000000}
+        ],
+        'pools': [
+            {'name': 'cmETH-USDT', 'apy': 0.085, 'tvl': 2000000}
+        ],
+        'rewards': {'totalAPY': 0.12, 'mntPrice': 0.45}
+    }
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.base_url = "https://api.init.capital"
-        self.session = None
-        
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        self.session = session
+        self._validators: Dict[str, Dict] = {}  # Per-URL ETag / Last-Modified and last body
     
     async def get_market_data(self) -> Dict:
         """Get INIT Capital market data"""
@@ -72,33 +152,36 @@ class InitCapitalAPI:
                 'rewards': f"{self.base_url}/v1/rewards"
             }
             
-            results = {}
-            for key, url in endpoints.items():
-                try:
-                    async with self.session.get(url, timeout=10) as response:
-                        if response.status == 200:
-                            results[key] = await response.json()
-                        else:
-                            logger.warning(f"INIT API {key} returned status {response.status}")
-                except Exception as e:
-                    logger.error(f"Error fetching INIT {key}: {e}")
-                    # Fallback to mock data
-                    results[key] = self._get_fallback_data(key)
-            
-            return results
+            # Endpoints are independent - fetch them concurrently
+            results = await asyncio.gather(*[self._fetch(key, url) for key, url in endpoints.items()])
+            return {key: data for key, data in results if data is not None}
             
         except Exception as e:
             logger.error(f"Error getting INIT Capital data: {e}")
             return self._get_fallback_init_data()
     
+    async def _fetch(self, key: str, url: str) -> Tuple[str, Optional[Dict]]:
+        """Fetch one INIT Capital endpoint; None if it answered with a non-200 status"""
+        try:
+            status, data = await _conditional_get_json(self.session, url, self._validators)
+            if status == 200:
+                return key, data
+            logger.warning(f"INIT API {key} returned status {status}")
+            return key, None
+        except Exception as e:
+            logger.error(f"Error fetching INIT {key}: {e}")
+            # Fallback to mock data
+            return key, self._get_fallback_data(key)
+    
     async def get_cmeth_looping_apy(self) -> float:
         """Get current APY for cmETH looping strategy"""
         try:
             market_data = await self.get_market_data()
             
             # Extract relevant data for looping calculation
-            cmeth_supply_apy = self._extract_supply_apy(market_data, "cmETH")
-            usdt_borrow_apy = self._extract_borrow_apy(market_data, "USDT")
+            markets = self._index_markets(market_data)
+            cmeth_supply_apy = self._extract_supply_apy(markets, "cmETH")
+            usdt_borrow_apy = self._extract_borrow_apy(markets, "USDT")
             mnt_rewards_apy = self._extract_rewards_apy(market_data, "MNT")
             
             # Calculate leveraged APY (3x leverage)
@@ -111,57 +194,47 @@ class InitCapitalAPI:
             logger.error(f"Error calculating INIT looping APY: {e}")
             return 8.5  # Fallback APY
     
-    def _extract_supply_apy(self, data: Dict, asset: str) -> float:
-        """Extract supply APY for an asset"""
+    def _index_markets(self, data: Dict) -> Dict[str, Dict]:
+        """Index market entries by symbol (first entry wins, as in a linear scan)"""
         try:
-            markets = data.get('markets', [])
-            for market in markets:
-                if market.get('symbol') == asset:
-                    return float(market.get('supplyAPY', 0)) * 100
+            return {market.get('symbol'): market for market in reversed(data.get('markets', []))}
+        except (AttributeError, TypeError):
+            return {}
+    
+    def _extract_supply_apy(self, markets: Dict[str, Dict], asset: str) -> float:
+        """Extract supply APY for an asset"""
+        market = markets.get(asset)
+        if market is None:
             return 4.2  # Fallback
-        except:
+        try:
+            return float(market.get('supplyAPY', 0)) * 100
+        except (TypeError, ValueError):
             return 4.2
     
-    def _extract_borrow_apy(self, data: Dict, asset: str) -> float:
+    def _extract_borrow_apy(self, markets: Dict[str, Dict], asset: str) -> float:
         """Extract borrow APY for an asset"""
-        try:
-            markets = data.get('markets', [])
-            for market in markets:
-                if market.get('symbol') == asset:
-                    return float(market.get('borrowAPY', 0)) * 100
+        market = markets.get(asset)
+        if market is None:
             return 6.8  # Fallback
-        except:
+        try:
+            return float(market.get('borrowAPY', 0)) * 100
+        except (TypeError, ValueError):
             return 6.8
     
     def _extract_rewards_apy(self, data: Dict, reward_token: str) -> float:
         """Extract rewards APY"""
         try:
-            rewards = data.get('rewards', {})
-            return float(rewards.get('totalAPY', 0)) * 100
-        except:
+            return float(data.get('rewards', {}).get('totalAPY', 0)) * 100
+        except (AttributeError, TypeError, ValueError):
             return 12.0  # Fallback
     
     def _get_fallback_data(self, key: str) -> Dict:
         """Fallback data when API is unavailable"""
-        fallbacks = {
-            'markets': [
-                {'symbol': 'cmETH', 'supplyAPY': 0.042, 'borrowAPY': 0.035, 'tvl': 5000000},
-                {'symbol': 'USDT', 'supplyAPY': 0.028, 'borrowAPY': 0.068, 'tvl': 8000000}
-            ],
-            'pools': [
-                {'name': 'cmETH-USDT', 'apy': 0.085, 'tvl': 2000000}
-            ],
-            'rewards': {'totalAPY': 0.12, 'mntPrice': 0.45}
-        }
-        return fallbacks.get(key, {})
+        return copy.deepcopy(self._FALLBACK_DATA.get(key, {}))
     
     def _get_fallback_init_data(self) -> Dict:
         """Complete fallback data structure"""
-        return {
-            'markets': self._get_fallback_data('markets'),
-            'pools': self._get_fallback_data('pools'),
-            'rewards': self._get_fallback_data('rewards')
-        }
+        return copy.deepcopy(self._FALLBACK_DATA)
 
 # ==============================================================================
 # CIRCUIT PROTOCOL API INTEGRATION
@@ -170,17 +243,28 @@ class InitCapitalAPI:
 class CircuitProtocolAPI:
     """API integration for Circuit Protocol on Mantle Network"""
     
-    def __init__(self):
+    # Fallback data when API is unavailable (shared template - callers get deep copies)
+    _FALLBACK_DATA = {
+        'vaults': [
+            {
+                'name': 'Auto-Compounding USDC Vault',
+                'strategy_type': 'auto_compounding',
+                'apy': 0.068,
+                'tvl': 3000000,
+                'risk_score': 0.4
+            }
+        ],
+        'performance': {'avg_apy': 0.065, 'volatility': 0.15},
+        'strategies': [
+            {'name': 'Leveraged Lending', 'apy': 0.072, 'allocation': 0.6},
+            {'name': 'LP Farming', 'apy': 0.058, 'allocation': 0.4}
+        ]
+    }
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.base_url = "https://api.circuit.fi"
-        self.session = None
-        
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        self.session = session
+        self._validators: Dict[str, Dict] = {}  # Per-URL ETag / Last-Modified and last body
     
     async def get_vault_data(self) -> Dict:
         """Get Circuit Protocol vault data"""
@@ -192,24 +276,26 @@ class CircuitProtocolAPI:
                 'strategies': f"{self.base_url}/v1/strategies"
             }
             
-            results = {}
-            for key, url in endpoints.items():
-                try:
-                    async with self.session.get(url, timeout=10) as response:
-                        if response.status == 200:
-                            results[key] = await response.json()
-                        else:
-                            logger.warning(f"Circuit API {key} returned status {response.status}")
-                except Exception as e:
-                    logger.error(f"Error fetching Circuit {key}: {e}")
-                    results[key] = self._get_fallback_vault_data(key)
-            
-            return results
+            # Endpoints are independent - fetch them concurrently
+            results = await asyncio.gather(*[self._fetch(key, url) for key, url in endpoints.items()])
+            return {key: data for key, data in results if data is not None}
             
         except Exception as e:
             logger.error(f"Error getting Circuit Protocol data: {e}")
             return self._get_fallback_circuit_data()
     
+    async def _fetch(self, key: str, url: str) -> Tuple[str, Optional[Dict]]:
+        """Fetch one Circuit Protocol endpoint; None if it answered with a non-200 status"""
+        try:
+            status, data = await _conditional_get_json(self.session, url, self._validators)
+            if status == 200:
+                return key, data
+            logger.warning(f"Circuit API {key} returned status {status}")
+            return key, None
+        except Exception as e:
+            logger.error(f"Error fetching Circuit {key}: {e}")
+            return key, self._get_fallback_vault_data(key)
+    
     async def get_auto_compounding_apy(self) -> float:
         """Get current APY for auto-compounding vaults"""
         try:
@@ -232,31 +318,11 @@ class CircuitProtocolAPI:
     
     def _get_fallback_vault_data(self, key: str) -> Dict:
         """Fallback data for Circuit Protocol"""
-        fallbacks = {
-            'vaults': [
-                {
-                    'name': 'Auto-Compounding USDC Vault',
-                    'strategy_type': 'auto_compounding',
-                    'apy': 0.068,
-                    'tvl': 3000000,
-                    'risk_score': 0.4
-                }
-            ],
-            'performance': {'avg_apy': 0.065, 'volatility': 0.15},
-            'strategies': [
-                {'name': 'Leveraged Lending', 'apy': 0.072, 'allocation': 0.6},
-                {'name': 'LP Farming', 'apy': 0.058, 'allocation': 0.4}
-            ]
-        }
-        return fallbacks.get(key, {})
+        return copy.deepcopy(self._FALLBACK_DATA.get(key, {}))
     
     def _get_fallback_circuit_data(self) -> Dict:
         """Complete fallback data for Circuit Protocol"""
-        return {
-            'vaults': self._get_fallback_vault_data('vaults'),
-            'performance': self._get_fallback_vault_data('performance'),
-            'strategies': self._get_fallback_vault_data('strategies')
-        }
+        return copy.deepcopy(self._FALLBACK_DATA)
 
 # ==============================================================================
 # MANTLE STAKING API INTEGRATION
@@ -265,17 +331,24 @@ class CircuitProtocolAPI:
 class MantleStakingAPI:
     """API integration for Mantle Network staking"""
     
-    def __init__(self):
+    # Fallback data when API is unavailable (shared template - callers get deep copies)
+    _FALLBACK_DATA = {
+        'staking': {
+            'base_apy': 0.038,
+            'total_staked': 45000000,
+            'staking_ratio': 0.65
+        },
+        'rewards': {
+            'fee_share_apy': 0.007,
+            'avg_daily_fees': 125000
+        },
+        'validators': {'active_validators': 125, 'avg_commission': 0.05}
+    }
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.base_url = "https://api.mantle.xyz"
-        self.session = None
-        
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        self.session = session
+        self._validators: Dict[str, Dict] = {}  # Per-URL ETag / Last-Modified and last body
     
     async def get_staking_data(self) -> Dict:
         """Get Mantle staking data"""
@@ -287,24 +360,26 @@ class MantleStakingAPI:
                 'validators': f"{self.base_url}/v1/validators"
             }
             
-            results = {}
-            for key, url in endpoints.items():
-                try:
-                    async with self.session.get(url, timeout=10) as response:
-                        if response.status == 200:
-                            results[key] = await response.json()
-                        else:
-                            logger.warning(f"Mantle API {key} returned status {response.status}")
-                except Exception as e:
-                    logger.error(f"Error fetching Mantle {key}: {e}")
-                    results[key] = self._get_fallback_staking_data(key)
-            
-            return results
+            # Endpoints are independent - fetch them concurrently
+            results = await asyncio.gather(*[self._fetch(key, url) for key, url in endpoints.items()])
+            return {key: data for key, data in results if data is not None}
             
         except Exception as e:
             logger.error(f"Error getting Mantle staking data: {e}")
             return self._get_fallback_mantle_data()
     
+    async def _fetch(self, key: str, url: str) -> Tuple[str, Optional[Dict]]:
+        """Fetch one Mantle staking endpoint; None if it answered with a non-200 status"""
+        try:
+            status, data = await _conditional_get_json(self.session, url, self._validators)
+            if status == 200:
+                return key, data
+            logger.warning(f"Mantle API {key} returned status {status}")
+            return key, None
+        except Exception as e:
+            logger.error(f"Error fetching Mantle {key}: {e}")
+            return key, self._get_fallback_staking_data(key)
+    
     async def get_staking_apy(self) -> float:
         """Get current MNT staking APY"""
         try:
@@ -322,137 +397,82 @@ class MantleStakingAPI:
     
     def _get_fallback_staking_data(self, key: str) -> Dict:
         """Fallback data for Mantle staking"""
-        fallbacks = {
-            'staking': {
-                'base_apy': 0.038,
-                'total_staked': 45000000,
-                'staking_ratio': 0.65
-            },
-            'rewards': {
-                'fee_share_apy': 0.007,
-                'avg_daily_fees': 125000
-            },
-            'validators': {'active_validators': 125, 'avg_commission': 0.05}
-        }
-        return fallbacks.get(key, {})
+        return copy.deepcopy(self._FALLBACK_DATA.get(key, {}))
     
     def _get_fallback_mantle_data(self) -> Dict:
         """Complete fallback data for Mantle staking"""
-        return {
-            'staking': self._get_fallback_staking_data('staking'),
-            'rewards': self._get_fallback_staking_data('rewards'),
-            'validators': self._get_fallback_staking_data('validators')
-        }
+        return copy.deepcopy(self._FALLBACK_DATA)
 
 # ==============================================================================
 # PRICE DATA INTEGRATION
 # ==============================================================================
 
+# Symbol -> CoinGecko id
+_TOKEN_MAP = {
+    'MNT': 'mantle',
+    'ETH': 'ethereum',
+    'USDC': 'usd-coin',
+    'USDT': 'tether',
+    'WETH': 'ethereum'
+}
+
+# Prices used when CoinGecko has no quote for a token
+_FALLBACK_PRICES = {
+    'MNT': 0.45,
+    'ETH': 2400,
+    'USDC': 1.0,
+    'USDT': 1.0,
+    'WETH': 2400
+}
+
 class PriceDataAPI:
     """Integration for price data from multiple sources"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.sources = {
             'coingecko': 'https://api.coingecko.com/api/v3',
             'dexscreener': 'https://api.dexscreener.com/latest',
             'mantle_dex': 'https://api.mantleswap.xyz/v1'  # Example
         }
-        self.session = None
-        
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        self.session = session
     
     async def get_token_prices(self, tokens: List[str]) -> Dict[str, float]:
         """Get current prices for multiple tokens"""
-        prices = {}
-        
         # Try CoinGecko first
         try:
             coingecko_prices = await self._get_coingecko_prices(tokens)
-            prices.update(coingecko_prices)
         except Exception as e:
             logger.error(f"CoinGecko price fetch failed: {e}")
-        
-        # Fill missing prices from DEX data
-        missing_tokens = [t for t in tokens if t not in prices]
-        if missing_tokens:
-            try:
-                dex_prices = await self._get_dex_prices(missing_tokens)
-                prices.update(dex_prices)
-            except Exception as e:
-                logger.error(f"DEX price fetch failed: {e}")
+            coingecko_prices = {}
         
         # Fill remaining with fallback prices
-        fallback_prices = {
-            'MNT': 0.45,
-            'ETH': 2400,
-            'USDC': 1.0,
-            'USDT': 1.0,
-            'WETH': 2400
+        return {
+            token: coingecko_prices.get(token, _FALLBACK_PRICES.get(token, 1.0))
+            for token in tokens
         }
-        
-        for token in tokens:
-            if token not in prices:
-                prices[token] = fallback_prices.get(token, 1.0)
-        
-        return prices
     
     async def _get_coingecko_prices(self, tokens: List[str]) -> Dict[str, float]:
         """Fetch prices from CoinGecko"""
-        token_map = {
-            'MNT': 'mantle',
-            'ETH': 'ethereum',
-            'USDC': 'usd-coin',
-            'USDT': 'tether',
-            'WETH': 'ethereum'
-        }
-        
-        ids = [token_map.get(token, token.lower()) for token in tokens]
+        ids = [_TOKEN_MAP.get(token, token.lower()) for token in tokens]
         url = f"{self.sources['coingecko']}/simple/price"
         params = {
-            'ids': ','.join(ids),
+            'ids': ','.join(dict.fromkeys(ids)),  # ETH and WETH share an id
             'vs_currencies': 'usd'
         }
         
         try:
-            async with self.session.get(url, params=params, timeout=10) as response:
+            async with self.session.get(url, params=params, timeout=PRICE_TIMEOUT) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    prices = {}
-                    for token in tokens:
-                        gecko_id = token_map.get(token, token.lower())
-                        if gecko_id in data and 'usd' in data[gecko_id]:
-                            prices[token] = data[gecko_id]['usd']
-                    return prices
+                    data = orjson.loads(await response.read())
+                    return {
+                        token: data[gecko_id]['usd']
+                        for token, gecko_id in zip(tokens, ids)
+                        if 'usd' in data.get(gecko_id, {})
+                    }
         except Exception as e:
             logger.error(f"CoinGecko API error: {e}")
         
         return {}
-    
-    async def _get_dex_prices(self, tokens: List[str]) -> Dict[str, float]:
-        """Fetch prices from DEX aggregators"""
-        prices = {}
-        
-        # Try DexScreener for Mantle DEX prices
-        try:
-            url = f"{self.sources['dexscreener']}/dex/tokens"
-            # This would require token addresses, simplified for demo
-            # In practice, you'd map token symbols to addresses and fetch DEX prices
-            
-            # Placeholder implementation
-            for token in tokens:
-                if token == 'MNT':
-                    prices[token] = 0.45  # Example price from DEX
-                    
-        except Exception as e:
-            logger.error(f"DEX price fetch error: {e}")
-        
-        return prices
 
 # ==============================================================================
 # UNIFIED API MANAGER
@@ -469,28 +489,31 @@ class MantleAPIManager:
         
         self.cache = {}
         self.cache_ttl = 300  # 5 minutes
+        self._inflight: Dict[str, asyncio.Task] = {}  # Fetches shared by concurrent cache misses
+        
+        # Set whenever fresh comprehensive market data lands; swapped for a new event each time
+        self.update_event = asyncio.Event()
+        self.latest_market_data: Dict = {}
         
     async def __aenter__(self):
-        await self.init_api.__aenter__()
-        await self.circuit_api.__aenter__()
-        await self.staking_api.__aenter__()
-        await self.price_api.__aenter__()
+        # All API clients share one connection pool
+        session = await get_session()
+        for api in (self.init_api, self.circuit_api, self.staking_api, self.price_api):
+            api.session = session
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.init_api.__aexit__(exc_type, exc_val, exc_tb)
-        await self.circuit_api.__aexit__(exc_type, exc_val, exc_tb)
-        await self.staking_api.__aexit__(exc_type, exc_val, exc_tb)
-        await self.price_api.__aexit__(exc_type, exc_val, exc_tb)
+        # The shared session outlives this manager; it is closed via close_session() on shutdown
+        pass
     
     async def get_all_strategy_apys(self) -> Dict[str, float]:
         """Get APYs for all strategies"""
+        return await self._cached("strategy_apys", self._fetch_all_strategy_apys)
+    
+    async def _fetch_all_strategy_apys(self) -> Dict[str, float]:
+        """Fetch APYs for all strategies and cache the result"""
         cache_key = "strategy_apys"
         
-        # Check cache
-        if self._is_cached(cache_key):
-            return self.cache[cache_key]['data']
-        
         try:
             # Fetch all APYs concurrently
             init_apy_task = self.init_api.get_cmeth_looping_apy()
@@ -535,11 +558,12 @@ class MantleAPIManager:
     
     async def get_comprehensive_market_data(self) -> Dict:
         """Get comprehensive market data for all protocols"""
+        return await self._cached("market_data", self._fetch_comprehensive_market_data)
+    
+    async def _fetch_comprehensive_market_data(self) -> Dict:
+        """Fetch comprehensive market data for all protocols and cache the result"""
         cache_key = "market_data"
         
-        if self._is_cached(cache_key):
-            return self.cache[cache_key]['data']
-        
         try:
             # Fetch all data concurrently
             tasks = {
@@ -559,8 +583,10 @@ class MantleAPIManager:
                     results[key] = {}
             
             # Combine all data
+            apys = tuple(results['strategy_apys'].values())
+            best_apy, worst_apy = (max(apys), min(apys)) if apys else (0, 0)
             market_data = {
-                'timestamp': datetime.now(),
+                'timestamp': datetime.now(timezone.utc),
                 'strategy_performance': results['strategy_apys'],
                 'token_prices': results['token_prices'],
                 'protocol_data': {
@@ -569,34 +595,52 @@ class MantleAPIManager:
                     'mantle_staking': results['staking_data']
                 },
                 'market_summary': {
-                    'best_apy': max(results['strategy_apys'].values()),
-                    'apy_spread': max(results['strategy_apys'].values()) - min(results['strategy_apys'].values()),
+                    'best_apy': best_apy,
+                    'apy_spread': best_apy - worst_apy,
                     'mnt_price': results['token_prices'].get('MNT', 0.45),
                     'eth_price': results['token_prices'].get('ETH', 2400)
                 }
             }
             
             self._cache_data(cache_key, market_data)
+            self._publish_update(market_data)
             return market_data
             
         except Exception as e:
             logger.error(f"Error getting comprehensive market data: {e}")
             return {}
     
+    async def _cached(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return cached data, or run a single fetch shared by every concurrent caller"""
+        if self._is_cached(key):
+            return self.cache[key]['data']
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so one caller being cancelled doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+    
+    def _publish_update(self, market_data: Dict):
+        """Wake everyone waiting on update_event with the fresh market data"""
+        self.latest_market_data = market_data
+        # Swap in a fresh event before waking waiters so they re-arm for the next update
+        update_event, self.update_event = self.update_event, asyncio.Event()
+        update_event.set()
+    
     def _is_cached(self, key: str) -> bool:
         """Check if data is cached and still valid"""
-        if key not in self.cache:
-            return False
-        
-        cache_entry = self.cache[key]
-        age = time.time() - cache_entry['timestamp']
-        return age < self.cache_ttl
+        cache_entry = self.cache.get(key)
+        return cache_entry is not None and time.monotonic() < cache_entry['expires_at']
     
     def _cache_data(self, key: str, data: any):
-        """Cache data with timestamp"""
+        """Cache data with its monotonic expiry time"""
         self.cache[key] = {
             'data': data,
-            'timestamp': time.time()
+            'expires_at': time.monotonic() + self.cache_ttl
         }
 
 # ==============================================================================
@@ -620,6 +664,8 @@ async def main():
         print(f"Best APY: {market_data.get('market_summary', {}).get('best_apy', 0):.2f}%")
         print(f"APY Spread: {market_data.get('market_summary', {}).get('apy_spread', 0):.2f}%")
         print(f"MNT Price: ${market_data.get('market_summary', {}).get('mnt_price', 0):.3f}")
+    
+    await close_session()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
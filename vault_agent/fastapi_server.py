@@ -6,23 +6,37 @@ It connects the agent with the web interface and provides real-time data.
 """
 
 import asyncio
-import json
+import contextlib
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import os
+import time
+import orjson
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, Response
 from pydantic import BaseModel, Field
 import uvicorn
+import numpy as np
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import ConnectionError as RedisConnectionError
+except ImportError:  # Redis is optional - broadcasts stay local to the worker
+    aioredis = None
+    RedisConnectionError = OSError
 
 # Import our agent components
 from fomo_integration import IntegratedMantleVaultAgent
 from api_integrations import MantleAPIManager
-from mantle_vault_agent import MantleConfig
+from http_client import close_session
+from mantle_vault_agent import MantleConfig, STRATEGIES, STRATEGY_RISK_SCORES
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,23 +60,48 @@ async def lifespan(app: FastAPI):
     agent = IntegratedMantleVaultAgent()
     api_manager = MantleAPIManager()
     
+    # RPC and protocol APIs share one keep-alive connection pool
+    await agent.web3_manager.use_shared_session()
+    await agent.setup()
+    
     # Start API manager
     await api_manager.__aenter__()
     
-    # Start agent monitoring in background
-    # Note: In production, you might want to run this in a separate process
-    # asyncio.create_task(agent.enhanced_monitoring_loop())
-    
-    logger.info("✅ Agent server started successfully")
+    await manager.start_relay()
     
-    yield
+    # Background tasks are supervised by one TaskGroup so shutdown cancels and awaits them all
+    async with asyncio.TaskGroup() as task_group:
+        app.state.task_group = task_group
+        app.state.monitor_task = None
+        
+        # The agent's event poller and rebalance worker run in the same group
+        agent.task_group = task_group
+        
+        # Start agent monitoring in background
+        # Note: In production, you might want to run this in a separate process
+        # app.state.monitor_task = task_group.create_task(agent.enhanced_monitoring_loop())
+        
+        # Start periodic WebSocket broadcasts (on_event handlers don't run alongside a lifespan)
+        broadcast_task = task_group.create_task(periodic_broadcast())
+        
+        logger.info("✅ Agent server started successfully")
+        
+        yield
+        
+        # Cleanup
+        logger.info("🛑 Shutting down agent server...")
+        if agent:
+            agent.stop_monitoring()
+        broadcast_task.cancel()
+        if app.state.monitor_task:
+            app.state.monitor_task.cancel()
     
-    # Cleanup
-    logger.info("🛑 Shutting down agent server...")
-    if agent:
-        agent.stop_monitoring()
+    agent.task_group = None
+    await manager.stop_relay()
     if api_manager:
         await api_manager.__aexit__(None, None, None)
+    await agent.close()
+    await close_session()
 
 # ==============================================================================
 # PYDANTIC MODELS
@@ -106,37 +145,210 @@ class MarketData(BaseModel):
     apy_spread: float
     market_sentiment: str
 
+# ==============================================================================
+# MOCK STRATEGY DATA
+# ==============================================================================
+
+# Struct-of-arrays in STRATEGIES order
+STRATEGY_DISPLAY_NAMES = ("INIT Capital Looping", "Circuit Protocol Vault", "MNT Staking")
+FALLBACK_STRATEGY_APYS = np.array([8.5, 6.8, 4.5])
+MOCK_STRATEGY_ALLOCATIONS = np.array([45.0, 35.0, 20.0])  # Percentages
+MOCK_STRATEGY_TVLS = np.array([125000.0, 87500.0, 50000.0])
+MOCK_TOTAL_VALUE = float(MOCK_STRATEGY_TVLS.sum())
+
+# ==============================================================================
+# SERIALIZATION
+# ==============================================================================
+
+# One option set for HTTP and WebSocket payloads: aware UTC timestamps go out as RFC 3339 with a
+# Z suffix (ORJSONResponse's own defaults, non-str keys and numpy values, are kept)
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+class UTCJSONResponse(ORJSONResponse):
+    """ORJSONResponse rendered with the shared serialization options"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+# Fallback responses served while upstream data is unavailable, serialized once at import.
+# Bodies that carry a live timestamp get it spliced in by _stamped().
+_FALLBACK_MARKET_BYTES = orjson.dumps({
+    "token_prices": {"MNT": 0.45, "ETH": 2400, "USDC": 1.0},
+    "strategy_apys": {"init_looping": 8.5, "circuit_vault": 6.8, "mnt_staking": 4.5},
+    "best_strategy": "init_looping",
+    "apy_spread": 4.0,
+    "market_sentiment": "neutral"
+})
+_FALLBACK_STRATEGY_PERFORMANCE_BYTES = orjson.dumps({
+    "init_capital": {"current_apy": 8.5, "leverage_ratio": 3.0, "liquidation_risk": "Low", "tvl": 5000000},
+    "circuit_protocol": {"current_apy": 6.8, "auto_compound_rate": "Daily", "fees": "0.5%", "tvl": 3000000},
+    "mnt_staking": {"current_apy": 4.5, "staking_period": "Flexible", "slashing_risk": "None", "tvl": 45000000}
+})
+_FALLBACK_FOMO_BYTES = orjson.dumps({
+    "total_policies": 5,
+    "active_policies": 3,
+    "open_policies": 2,
+    "total_reserves_required": 45000,
+    "available_liquidity": 125000,
+    "reserve_ratio": 0.36,
+    "pending_settlements": 1
+})
+
+def _stamped(body: bytes, key: bytes) -> bytes:
+    """Append a current UTC timestamp field to a pre-serialized JSON object"""
+    return b"%s,\"%s\":%s}" % (body[:-1], key, orjson.dumps(datetime.now(timezone.utc), option=_ORJSON_OPTIONS))
+
 # ==============================================================================
 # WEBSOCKET CONNECTION MANAGER
 # ==============================================================================
 
+def _dumps(message: Union[Dict[str, Any], bytes]) -> bytes:
+    """Serialize a WebSocket message; datetimes are encoded natively, bytes pass through"""
+    if isinstance(message, bytes):
+        return message
+    return orjson.dumps(message, option=_ORJSON_OPTIONS)
+
+# Cross-worker broadcast channel (used when REDIS_URL is set)
+BROADCAST_CHANNEL = "vault_updates"
+
+# Messages buffered per client; a client that falls this far behind is dropped
+SEND_QUEUE_SIZE = 16
+
+# Delay before re-subscribing after the Redis connection drops
+RELAY_RETRY_SECONDS = 5.0
+
+@dataclass
+class Connection:
+    """A WebSocket client with its own bounded send queue and writer task"""
+    websocket: WebSocket
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=SEND_QUEUE_SIZE))
+    writer: Optional[asyncio.Task] = None
+
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates"""
     
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, redis_url: Optional[str] = None):
+        self.active_connections: Dict[WebSocket, Connection] = {}
+        self.redis_url = redis_url
+        self._redis = None
+        self._relay_task: Optional[asyncio.Task] = None
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        connection = Connection(websocket)
+        connection.writer = asyncio.create_task(self._writer(connection))
+        self.active_connections[websocket] = connection
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        connection = self.active_connections.get(websocket)
+        if connection:
+            self._drop(connection)
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+    async def _writer(self, connection: Connection):
+        """Drain one client's queue; the only task that writes to its socket"""
+        try:
+            while True:
+                payload = await connection.queue.get()
+                await connection.websocket.send_bytes(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Stale connection - forget it; its endpoint loop sees the disconnect
+            self._drop(connection)
+    
+    def _drop(self, connection: Connection):
+        """Forget a client and stop its writer"""
+        self.active_connections.pop(connection.websocket, None)
+        if connection.writer and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+    
+    async def _enqueue(self, connections: List[Connection], payload: bytes):
+        """Queue a payload for each client, dropping any whose queue is full"""
+        slow = []
+        for connection in connections:
+            try:
+                connection.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                slow.append(connection)
+        
+        for connection in slow:
+            logger.warning("⚠️ Dropping slow WebSocket client (send queue full)")
+            self._drop(connection)
+        if slow:
+            # 1013 Try Again Later - the client can reconnect and resync
+            await asyncio.gather(
+                *[connection.websocket.close(code=1013) for connection in slow],
+                return_exceptions=True
+            )
     
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
+    async def start_relay(self):
+        """Subscribe this worker to the Redis broadcast channel (no-op without Redis)"""
+        if not self.redis_url:
+            return
+        if aioredis is None:
+            logger.warning("⚠️ REDIS_URL set but redis is not installed; broadcasts stay local to this worker")
+            return
+        
+        self._redis = aioredis.from_url(self.redis_url)
+        self._relay_task = asyncio.create_task(self._relay())
+        logger.info(f"📡 Relaying WebSocket broadcasts via Redis channel '{BROADCAST_CHANNEL}'")
+    
+    async def stop_relay(self):
+        """Stop relaying and close the Redis connection"""
+        if self._relay_task:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.warning(f"⚠️ Redis relay ended with an error: {e}")
+            self._relay_task = None
+        if self._redis:
             try:
-                await connection.send_text(message)
-            except:
-                # Remove stale connections
-                self.active_connections.remove(connection)
+                await self._redis.aclose()
+            except Exception as e:
+                logger.warning(f"⚠️ Error closing Redis connection: {e}")
+            self._redis = None
+    
+    async def _relay(self):
+        """Forward every published broadcast to this worker's clients, re-subscribing if Redis drops"""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(BROADCAST_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        await self._local_broadcast(message["data"])
+            except (RedisConnectionError, OSError) as e:
+                logger.warning(f"⚠️ Redis relay disconnected, re-subscribing in {RELAY_RETRY_SECONDS:.0f}s: {e}")
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+            await asyncio.sleep(RELAY_RETRY_SECONDS)
+    
+    async def broadcast(self, message: Union[Dict[str, Any], bytes]):
+        """Serialize once and deliver to every client, across workers when Redis is configured"""
+        payload = _dumps(message)
+        if self._redis:
+            await self._redis.publish(BROADCAST_CHANNEL, payload)
+        else:
+            await self._local_broadcast(payload)
+    
+    async def broadcast_local(self, message: Union[Dict[str, Any], bytes]):
+        """Deliver only to this worker's clients (each worker sends its own periodic updates)"""
+        await self._local_broadcast(_dumps(message))
+    
+    async def _local_broadcast(self, payload: bytes):
+        """Queue a serialized payload for this worker's clients without waiting on their sockets"""
+        if not self.active_connections:
+            return
+        
+        await self._enqueue(list(self.active_connections.values()), payload)
 
-manager = ConnectionManager()
+manager = ConnectionManager(os.getenv("REDIS_URL"))
 
 # ==============================================================================
 # FASTAPI APP INITIALIZATION
@@ -146,21 +358,72 @@ app = FastAPI(
     title="Mantle Vault Agent API",
     description="REST API for the Mantle Vault APY Maximizer Agent",
     version="1.0.0",
+    default_response_class=UTCJSONResponse,
     lifespan=lifespan
 )
 
-# CORS middleware
+# CORS middleware - comma-separated CORS_ORIGINS overrides the local dashboard defaults
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify your domain
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
 )
 
+# Compress JSON responses; small bodies aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # Serve static files (dashboard)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# ==============================================================================
+# RESPONSE CACHE
+# ==============================================================================
+
+# Dashboards poll these endpoints; a short TTL bounds upstream RPC/API load
+RESPONSE_CACHE_TTL = 5  # seconds
+
+_response_cache: Dict[str, Tuple[float, Any]] = {}  # key -> (monotonic expiry, response)
+_response_inflight: Dict[str, asyncio.Task] = {}
+
+async def _cached_response(key: str, build: Callable[[], Awaitable[Any]]) -> Any:
+    """Return a cached response, or run a single build shared by every concurrent request"""
+    entry = _response_cache.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+    
+    task = _response_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_build_and_cache(key, build))
+        _response_inflight[key] = task
+        task.add_done_callback(lambda _: _response_inflight.pop(key, None))
+    
+    # Shield so one client disconnecting doesn't cancel the build for the others
+    return await asyncio.shield(task)
+
+async def _build_and_cache(key: str, build: Callable[[], Awaitable[Any]]) -> Any:
+    """Build a response and cache it; failures are not cached"""
+    response = await build()
+    _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, response)
+    return response
+
+def invalidate_response_cache():
+    """Drop cached responses after a state change (agent start/stop, rebalance)"""
+    _response_cache.clear()
+
+def _json_response(body: Union[Dict[str, Any], bytes]) -> Response:
+    """Wrap a built response; pre-serialized bodies are sent as-is"""
+    if isinstance(body, bytes):
+        return Response(content=body, media_type="application/json")
+    return UTCJSONResponse(body)
+
 # ==============================================================================
 # API ENDPOINTS
 # ==============================================================================
@@ -173,16 +436,21 @@ async def serve_dashboard():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    return {
+    # Returned as a response so the timestamp skips jsonable_encoder and uses the shared format
+    return UTCJSONResponse({
         "status": "healthy",
-        "timestamp": datetime.now(),
+        "timestamp": datetime.now(timezone.utc),
         "agent_running": agent is not None and agent.running,
         "api_manager_active": api_manager is not None
-    }
+    })
 
-@app.get("/api/vault/status", response_model=VaultStatus)
+@app.get("/api/vault/status", responses={200: {"model": VaultStatus}})
 async def get_vault_status():
     """Get current vault status"""
+    return _json_response(await _cached_response("vault_status", _build_vault_status))
+
+async def _build_vault_status() -> Dict:
+    """Assemble the vault status response"""
     try:
         if not agent:
             raise HTTPException(status_code=503, detail="Agent not initialized")
@@ -191,60 +459,55 @@ async def get_vault_status():
         dashboard_data = await agent.get_integrated_dashboard_data()
         
         # Get current APYs from API manager
-        if api_manager:
-            strategy_apys = await api_manager.get_all_strategy_apys()
-        else:
-            strategy_apys = {"init_looping": 8.5, "circuit_vault": 6.8, "mnt_staking": 4.5}
+        strategy_apys = await api_manager.get_all_strategy_apys() if api_manager else {}
+        apys = np.array([
+            strategy_apys.get(name, fallback)
+            for name, fallback in zip(STRATEGIES, FALLBACK_STRATEGY_APYS.tolist())
+        ])
         
-        # Mock data for demonstration
+        # Mock data for demonstration (shaped like StrategyMetrics; built as dicts to skip validation)
+        now = datetime.now(timezone.utc)
         strategies = [
-            StrategyMetrics(
-                name="INIT Capital Looping",
-                current_apy=strategy_apys.get("init_looping", 8.5),
-                allocation=45.0,
-                tvl=125000,
-                risk_score=0.7,
-                last_updated=datetime.now()
-            ),
-            StrategyMetrics(
-                name="Circuit Protocol Vault",
-                current_apy=strategy_apys.get("circuit_vault", 6.8),
-                allocation=35.0,
-                tvl=87500,
-                risk_score=0.4,
-                last_updated=datetime.now()
-            ),
-            StrategyMetrics(
-                name="MNT Staking",
-                current_apy=strategy_apys.get("mnt_staking", 4.5),
-                allocation=20.0,
-                tvl=50000,
-                risk_score=0.2,
-                last_updated=datetime.now()
+            {
+                "name": display_name,
+                "current_apy": apy,
+                "allocation": allocation,
+                "tvl": tvl,
+                "risk_score": risk_score,
+                "last_updated": now
+            }
+            for display_name, apy, allocation, tvl, risk_score in zip(
+                STRATEGY_DISPLAY_NAMES, apys.tolist(), MOCK_STRATEGY_ALLOCATIONS.tolist(),
+                MOCK_STRATEGY_TVLS.tolist(), STRATEGY_RISK_SCORES.tolist()
             )
         ]
         
-        total_value = sum(s.tvl for s in strategies)
-        weighted_apy = sum(s.current_apy * s.allocation / 100 for s in strategies)
-        
-        return VaultStatus(
-            total_value=total_value,
-            available_balance=12500,
-            deployed_value=total_value - 12500,
-            current_apy=weighted_apy,
-            strategies=strategies,
-            last_rebalance=agent.vault_state.last_rebalance,
-            agent_status="Active" if agent.running else "Stopped",
-            performance_24h=2.3
-        )
+        total_value = MOCK_TOTAL_VALUE
+        weighted_apy = float(np.dot(apys, MOCK_STRATEGY_ALLOCATIONS)) / 100
+        
+        # Shaped like VaultStatus
+        return {
+            "total_value": total_value,
+            "available_balance": 12500,
+            "deployed_value": total_value - 12500,
+            "current_apy": weighted_apy,
+            "strategies": strategies,
+            "last_rebalance": agent.vault_state.last_rebalance,
+            "agent_status": "Active" if agent.running else "Stopped",
+            "performance_24h": 2.3
+        }
         
     except Exception as e:
         logger.error(f"Error getting vault status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/market/data", response_model=MarketData)
+@app.get("/api/market/data", responses={200: {"model": MarketData}})
 async def get_market_data():
     """Get current market data"""
+    return _json_response(await _cached_response("market_data", _build_market_data))
+
+async def _build_market_data() -> Union[Dict, bytes]:
+    """Assemble the market data response"""
     try:
         if api_manager:
             market_data = await api_manager.get_comprehensive_market_data()
@@ -256,24 +519,18 @@ async def get_market_data():
             best_apy = max(strategy_apys.values()) if strategy_apys else 0
             best_strategy = max(strategy_apys.items(), key=lambda x: x[1])[0] if strategy_apys else "unknown"
             
-            return MarketData(
-                timestamp=datetime.now(),
-                token_prices=token_prices,
-                strategy_apys=strategy_apys,
-                best_strategy=best_strategy,
-                apy_spread=market_summary.get('apy_spread', 0),
-                market_sentiment="bullish" if market_summary.get('mnt_price', 0) > 0.45 else "bearish"
-            )
+            # Shaped like MarketData
+            return {
+                "timestamp": datetime.now(timezone.utc),
+                "token_prices": token_prices,
+                "strategy_apys": strategy_apys,
+                "best_strategy": best_strategy,
+                "apy_spread": market_summary.get('apy_spread', 0),
+                "market_sentiment": "bullish" if market_summary.get('mnt_price', 0) > 0.45 else "bearish"
+            }
         else:
             # Fallback data
-            return MarketData(
-                timestamp=datetime.now(),
-                token_prices={"MNT": 0.45, "ETH": 2400, "USDC": 1.0},
-                strategy_apys={"init_looping": 8.5, "circuit_vault": 6.8, "mnt_staking": 4.5},
-                best_strategy="init_looping",
-                apy_spread=4.0,
-                market_sentiment="neutral"
-            )
+            return _stamped(_FALLBACK_MARKET_BYTES, b"timestamp")
             
     except Exception as e:
         logger.error(f"Error getting market data: {e}")
@@ -294,18 +551,19 @@ async def rebalance_vault(request: RebalanceRequest, background_tasks: Backgroun
         )
         
         # Broadcast update to WebSocket clients
-        await manager.broadcast(json.dumps({
+        now = datetime.now(timezone.utc)
+        await manager.broadcast({
             "type": "rebalance_started",
             "risk_tolerance": request.risk_tolerance,
-            "timestamp": datetime.now().isoformat()
-        }))
+            "timestamp": now
+        })
         
-        return {
+        return UTCJSONResponse({
             "message": "Rebalancing started",
             "risk_tolerance": request.risk_tolerance,
             "force": request.force,
-            "estimated_completion": (datetime.now() + timedelta(minutes=2)).isoformat()
-        }
+            "estimated_completion": now + timedelta(minutes=2)
+        })
         
     except Exception as e:
         logger.error(f"Error starting rebalance: {e}")
@@ -330,11 +588,11 @@ async def set_custom_allocation(request: AllocationRequest):
         result = {"message": "Custom allocation set", "allocations": request.allocations}
         
         # Broadcast update
-        await manager.broadcast(json.dumps({
+        await manager.broadcast({
             "type": "allocation_updated",
             "allocations": request.allocations,
-            "timestamp": datetime.now().isoformat()
-        }))
+            "timestamp": datetime.now(timezone.utc)
+        })
         
         return result
         
@@ -345,6 +603,10 @@ async def set_custom_allocation(request: AllocationRequest):
 @app.get("/api/strategies/performance")
 async def get_strategy_performance():
     """Get detailed strategy performance metrics"""
+    return _json_response(await _cached_response("strategy_performance", _build_strategy_performance))
+
+async def _build_strategy_performance() -> Union[Dict, bytes]:
+    """Assemble the strategy performance response"""
     try:
         if api_manager:
             market_data = await api_manager.get_comprehensive_market_data()
@@ -372,11 +634,7 @@ async def get_strategy_performance():
             }
         else:
             # Fallback data
-            return {
-                "init_capital": {"current_apy": 8.5, "leverage_ratio": 3.0, "liquidation_risk": "Low", "tvl": 5000000},
-                "circuit_protocol": {"current_apy": 6.8, "auto_compound_rate": "Daily", "fees": "0.5%", "tvl": 3000000},
-                "mnt_staking": {"current_apy": 4.5, "staking_period": "Flexible", "slashing_risk": "None", "tvl": 45000000}
-            }
+            return _FALLBACK_STRATEGY_PERFORMANCE_BYTES
             
     except Exception as e:
         logger.error(f"Error getting strategy performance: {e}")
@@ -385,6 +643,10 @@ async def get_strategy_performance():
 @app.get("/api/fomo/status")
 async def get_fomo_status():
     """Get FOMO Insurance protocol status"""
+    return _json_response(await _cached_response("fomo_status", _build_fomo_status))
+
+async def _build_fomo_status() -> Union[Dict, bytes]:
+    """Assemble the FOMO Insurance status response"""
     try:
         if not agent:
             raise HTTPException(status_code=503, detail="Agent not initialized")
@@ -402,20 +664,11 @@ async def get_fomo_status():
                 "reserve_ratio": (snapshot.total_reserves_required / snapshot.available_liquidity 
                                 if snapshot.available_liquidity > 0 else 0),
                 "pending_settlements": len(snapshot.pending_settlements),
-                "last_updated": snapshot.timestamp.isoformat()
+                "last_updated": snapshot.timestamp
             }
         else:
             # Return mock data if no snapshot available
-            return {
-                "total_policies": 5,
-                "active_policies": 3,
-                "open_policies": 2,
-                "total_reserves_required": 45000,
-                "available_liquidity": 125000,
-                "reserve_ratio": 0.36,
-                "pending_settlements": 1,
-                "last_updated": datetime.now().isoformat()
-            }
+            return _stamped(_FALLBACK_FOMO_BYTES, b"last_updated")
             
     except Exception as e:
         logger.error(f"Error getting FOMO status: {e}")
@@ -428,16 +681,18 @@ async def start_agent():
         if not agent:
             raise HTTPException(status_code=503, detail="Agent not initialized")
         
-        if agent.running:
+        monitor_task = app.state.monitor_task
+        if agent.running or (monitor_task and not monitor_task.done()):
             return {"message": "Agent is already running"}
         
-        # Start agent in background
-        asyncio.create_task(agent.enhanced_monitoring_loop())
+        # Start agent in background, supervised by the lifespan TaskGroup
+        app.state.monitor_task = app.state.task_group.create_task(agent.enhanced_monitoring_loop())
+        invalidate_response_cache()
         
-        await manager.broadcast(json.dumps({
+        await manager.broadcast({
             "type": "agent_started",
-            "timestamp": datetime.now().isoformat()
-        }))
+            "timestamp": datetime.now(timezone.utc)
+        })
         
         return {"message": "Agent started successfully"}
         
@@ -453,11 +708,12 @@ async def stop_agent():
             raise HTTPException(status_code=503, detail="Agent not initialized")
         
         agent.stop_monitoring()
+        invalidate_response_cache()
         
-        await manager.broadcast(json.dumps({
+        await manager.broadcast({
             "type": "agent_stopped",
-            "timestamp": datetime.now().isoformat()
-        }))
+            "timestamp": datetime.now(timezone.utc)
+        })
         
         return {"message": "Agent stopped successfully"}
         
@@ -475,24 +731,13 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
         while True:
-            # Send periodic updates
-            await asyncio.sleep(30)  # Send update every 30 seconds
+            # Updates are pushed by periodic_broadcast; just wait for the client to go away
+            await websocket.receive_text()
             
-            if agent and api_manager:
-                # Get current data
-                vault_status = await get_vault_status()
-                market_data = await get_market_data()
-                
-                update = {
-                    "type": "periodic_update",
-                    "timestamp": datetime.now().isoformat(),
-                    "vault_status": vault_status.dict(),
-                    "market_data": market_data.dict()
-                }
-                
-                await manager.send_personal_message(json.dumps(update), websocket)
-                
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Any exit (binary frame, protocol error, cancellation) must unregister the client and its writer
         manager.disconnect(websocket)
 
 # ==============================================================================
@@ -506,13 +751,14 @@ async def execute_rebalance_task(risk_tolerance: str, force: bool):
         
         if agent:
             result = await agent.manual_rebalance(risk_tolerance)
+            invalidate_response_cache()
             
             # Broadcast completion
-            await manager.broadcast(json.dumps({
+            await manager.broadcast({
                 "type": "rebalance_completed",
                 "result": result,
-                "timestamp": datetime.now().isoformat()
-            }))
+                "timestamp": datetime.now(timezone.utc)
+            })
             
             logger.info("Rebalance task completed successfully")
         
@@ -520,52 +766,73 @@ async def execute_rebalance_task(risk_tolerance: str, force: bool):
         logger.error(f"Error in rebalance task: {e}")
         
         # Broadcast error
-        await manager.broadcast(json.dumps({
+        await manager.broadcast({
             "type": "rebalance_failed",
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }))
+            "timestamp": datetime.now(timezone.utc)
+        })
 
 # ==============================================================================
 # PERIODIC TASKS
 # ==============================================================================
 
+STATUS_BROADCAST_INTERVAL = 30  # seconds between periodic_update messages when nothing else happens
+
 async def periodic_broadcast():
-    """Periodic task to broadcast updates to connected clients"""
+    """Push market updates as fresh data lands; refresh vault status on a slow fallback tick"""
     while True:
         try:
-            await asyncio.sleep(60)  # Broadcast every minute
+            if not (agent and api_manager):
+                await asyncio.sleep(STATUS_BROADCAST_INTERVAL)
+                continue
+            
+            # _publish_update swaps in a fresh event before setting this one, so hold on to it
+            # to notice refreshes that land while the fallback tick below is fetching
+            update_event = api_manager.update_event
+            try:
+                await asyncio.wait_for(update_event.wait(), timeout=STATUS_BROADCAST_INTERVAL)
+            except asyncio.TimeoutError:
+                if manager.active_connections:
+                    # Fetch once per tick and share the payload across every connection
+                    vault_status, market_data = await asyncio.gather(
+                        _cached_response("vault_status", _build_vault_status),
+                        _cached_response("market_data", _build_market_data)
+                    )
+                    
+                    await manager.broadcast_local({
+                        "type": "periodic_update",
+                        "timestamp": datetime.now(timezone.utc),
+                        "vault_status": vault_status,
+                        "market_data": market_data
+                    })
+                
+                # A market data refresh triggered by this tick still gets its market_update
+                if not update_event.is_set():
+                    continue
             
-            if manager.active_connections and agent and api_manager:
-                # Get latest data
-                market_data = await api_manager.get_comprehensive_market_data()
+            if manager.active_connections:
+                # Fresh data just landed
+                market_data = api_manager.latest_market_data
                 
                 broadcast_data = {
                     "type": "market_update",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": datetime.now(timezone.utc),
                     "strategy_apys": market_data.get('strategy_performance', {}),
                     "best_strategy": market_data.get('market_summary', {}).get('best_apy', 0),
                     "mnt_price": market_data.get('token_prices', {}).get('MNT', 0.45)
                 }
                 
-                await manager.broadcast(json.dumps(broadcast_data))
+                await manager.broadcast_local(broadcast_data)
                 
         except Exception as e:
             logger.error(f"Error in periodic broadcast: {e}")
-
-# Start periodic broadcast task
-@app.on_event("startup")
-async def startup_event():
-    """Start background tasks on server startup"""
-    asyncio.create_task(periodic_broadcast())
+            await asyncio.sleep(STATUS_BROADCAST_INTERVAL)
 
 # ==============================================================================
 # MAIN SERVER RUNNER
 # ==============================================================================
 
 if __name__ == "__main__":
-    import os
-    
     # Check environment
     if not os.getenv("AGENT_PRIVATE_KEY"):
         logger.warning("⚠️ AGENT_PRIVATE_KEY not set. Some features may not work.")
@@ -573,13 +840,34 @@ if __name__ == "__main__":
     if not os.getenv("OPENAI_API_KEY"):
         logger.warning("⚠️ OPENAI_API_KEY not set. LLM features will be limited.")
     
+    # uvloop + httptools roughly double throughput; both are optional
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
+    # Each worker runs its own agent (signer, nonce), so keep one unless transactions are
+    # coordinated across processes; with more, set REDIS_URL so broadcasts reach every worker
+    workers = int(os.getenv("SERVER_WORKERS", "1"))
+    
     # Run the server
-    logger.info("🚀 Starting Mantle Vault Agent FastAPI server...")
+    logger.info(f"🚀 Starting Mantle Vault Agent FastAPI server ({loop}/{http}, {workers} worker(s))...")
     
     uvicorn.run(
         "fastapi_server:app",
         host="0.0.0.0",
         port=8000,
         reload=False,  # Set to True for development
+        loop=loop,
+        http=http,
+        workers=workers,
+        access_log=False,  # Per-request access logging is a major throughput cost
+        ws_per_message_deflate=True,  # Compress WebSocket updates
         log_level="info"
     )
\ No newline at end of file
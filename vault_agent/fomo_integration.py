@@ -8,17 +8,22 @@ to automatically manage fund allocation based on policy activity and requirement
 import asyncio
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from dataclasses import dataclass, field
 from decimal import Decimal
 
-from web3 import Web3
-from web3.exceptions import ContractLogicError
-from eth_abi import decode_abi
+from web3 import AsyncWeb3
+from web3.exceptions import ContractLogicError, Web3RPCError
+import aiohttp
+from eth_abi import decode, encode
 
 # Import your main agent
-from mantle_vault_agent import MantleVaultAgent, MantleConfig
+from http_client import close_session
+from mantle_vault_agent import MantleVaultAgent, MantleConfig, BALANCE_OF_SELECTOR, STRATEGIES, to_checksum
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +31,7 @@ logger = logging.getLogger(__name__)
 # FOMO INSURANCE PROTOCOL DATA STRUCTURES
 # ==============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PolicyInfo:
     """Information about a FOMO Insurance policy"""
     policy_id: int
@@ -44,24 +49,22 @@ class PolicyInfo:
     expiry_timestamp: Optional[int]
     state: str  # Open, Active, Settled, Cancelled
     
-    @property
-    def is_active(self) -> bool:
-        return self.state == "Active"
+    # Derived once at construction; read in the reserve summation loops
+    is_active: bool = field(init=False)
+    required_reserve: float = field(init=False)  # Reserve needed for this policy's payout
+    
+    def __post_init__(self):
+        is_active = self.state == "Active"
+        object.__setattr__(self, 'is_active', is_active)
+        object.__setattr__(self, 'required_reserve', self.payout_amount if is_active else 0.0)
     
     @property
     def time_to_expiry(self) -> Optional[int]:
         if self.expiry_timestamp:
             return max(0, self.expiry_timestamp - int(datetime.now().timestamp()))
         return None
-    
-    @property
-    def required_reserve(self) -> float:
-        """Calculate required reserve for this policy"""
-        if self.is_active:
-            return self.payout_amount
-        return 0.0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProtocolSnapshot:
     """Snapshot of the FOMO Insurance protocol state"""
     total_policies: int
@@ -71,6 +74,147 @@ class ProtocolSnapshot:
     available_liquidity: float
     pending_settlements: List[PolicyInfo]
     timestamp: datetime
+    block_number: int = 0  # Block the snapshot was read at (0 when the read failed)
+    
+    @property
+    def state_key(self) -> Tuple[int, float, int, float]:
+        """The fields that drive allocation"""
+        return (self.total_policies, self.total_reserves_required,
+                len(self.active_policies), self.available_liquidity)
+    
+    @property
+    def state_digest(self) -> int:
+        """Hash of state_key; equal digests mean nothing worth acting on changed"""
+        return hash(self.state_key)
+    
+    def upcoming_expirations(self, within: int = 3600) -> int:
+        """Count active policies expiring within `within` seconds, in one pass with one clock read"""
+        now = int(datetime.now().timestamp())
+        count = 0
+        for p in self.active_policies:
+            expiry = p.expiry_timestamp
+            if expiry and 0 < expiry - now < within:
+                count += 1
+        return count
+
+class Allocation(NamedTuple):
+    """Target allocation percentages per strategy, in STRATEGIES order"""
+    init_looping: float
+    circuit_vault: float
+    mnt_staking: float
+
+# ==============================================================================
+# CONTRACT ABIS
+# ==============================================================================
+
+# Simplified ABI - you'd load the full ABI
+FOMO_ABI = [
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "policyId", "type": "uint256"},
+            {"indexed": True, "name": "seller", "type": "address"},
+            {"indexed": True, "name": "token", "type": "address"},
+            {"indexed": False, "name": "amount", "type": "uint256"},
+            {"indexed": False, "name": "payoutAmount", "type": "uint256"},
+            {"indexed": False, "name": "duration", "type": "uint256"},
+            {"indexed": False, "name": "upsideShareBps", "type": "uint16"}
+        ],
+        "name": "PolicyCreated",
+        "type": "event"
+    }
+]
+
+# Policy events as declared in PolicyManager and SettlementEngine (purchases emit none)
+EVENT_SIGNATURES = {
+    'PolicyCreated': "PolicyCreated(uint256,address,address,uint256,uint256,uint256,uint16)",
+    'PolicyCancelled': "PolicyCancelled(uint256,address)",
+    'PolicySettled': "PolicySettled(uint256,uint256,uint256,uint256,uint256)"
+}
+EVENT_TOPICS = {name: AsyncWeb3.to_hex(AsyncWeb3.keccak(text=sig)) for name, sig in EVENT_SIGNATURES.items()}
+TOPIC_EVENTS = {topic: name for name, topic in EVENT_TOPICS.items()}
+
+# ==============================================================================
+# MULTICALL
+# ==============================================================================
+
+# Multicall3 is deployed at the same address on Mantle and every major EVM chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
+    {
+        "inputs": [{
+            "components": [
+                {"name": "target", "type": "address"},
+                {"name": "allowFailure", "type": "bool"},
+                {"name": "callData", "type": "bytes"}
+            ],
+            "name": "calls",
+            "type": "tuple[]"
+        }],
+        "name": "aggregate3",
+        "outputs": [{
+            "components": [
+                {"name": "success", "type": "bool"},
+                {"name": "returnData", "type": "bytes"}
+            ],
+            "name": "returnData",
+            "type": "tuple[]"
+        }],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+GET_POLICY_SELECTOR = AsyncWeb3.keccak(text="getPolicy(uint256)")[:4]
+GET_OPEN_POLICY_IDS_SELECTOR = AsyncWeb3.keccak(text="getOpenPolicyIds()")[:4]
+GET_BLOCK_NUMBER_SELECTOR = AsyncWeb3.keccak(text="getBlockNumber()")[:4]  # Multicall3 view
+# IPolicyStorage.Policy field types, in the order PolicyInfo reads them
+POLICY_STRUCT_FIELDS = [
+    "address",  # seller
+    "address",  # buyer
+    "address",  # token
+    "string",   # token symbol
+    "uint256",  # amount
+    "address",  # payout token
+    "uint256",  # payout amount
+    "uint256",  # duration
+    "uint16",   # upside share bps
+    "uint256",  # entry price
+    "uint256",  # start timestamp
+    "uint256",  # expiry timestamp
+    "uint8"     # state
+]
+# getPolicy returns the Policy struct, ABI-encoded as a single tuple (it has a dynamic string)
+GET_POLICY_OUTPUT_TYPES = [f"({','.join(POLICY_STRUCT_FIELDS)})"]
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+ALLOCATION_CACHE_SIZE = 64  # Allocation results memoized by _calculate_integrated_allocation, LRU evicted
+
+APY_TTL_SECONDS = 300  # How long a fetched strategy APY is reused by the integrated agent
+RPC_ERROR_BACKOFF = 5.0  # seconds; node/transport errors are usually transient
+MAX_ERROR_BACKOFF = 300.0  # cap for the exponential backoff on unexpected errors
+MONITOR_INTERVAL_JITTER = 0.05  # +/-5% on the cycle interval so restarted agents don't poll in lockstep
+POLICY_EVENT_POLL_INTERVAL = 15.0  # seconds between eth_getLogs polls for policy events
+REBALANCE_DEBOUNCE_SECONDS = 2.0  # Policy events within this window share one rebalance (~1 block)
+
+def _normalized_allocation(risk_multiplier: float) -> Allocation:
+    """Base allocation percentages with the INIT share scaled by the policy-activity risk multiplier"""
+    base_allocation = Allocation(
+        init_looping=0.45 * risk_multiplier,
+        circuit_vault=0.35,
+        mnt_staking=0.20
+    )
+    total_allocation = sum(base_allocation)
+    return Allocation(*((v / total_allocation) * 100 for v in base_allocation))
+
+# Risk-adjusted allocations by policy-activity tier, computed once
+ALLOCATION_TABLES = {
+    "low": _normalized_allocation(1.2),   # Low policy activity - more aggressive
+    "mid": _normalized_allocation(1.0),
+    "high": _normalized_allocation(0.8),  # High policy activity - more conservative
+}
+NO_ALLOCATION = Allocation(0.0, 0.0, 0.0)
 
 # ==============================================================================
 # FOMO INSURANCE MONITOR
@@ -79,111 +223,173 @@ class ProtocolSnapshot:
 class FOMOInsuranceMonitor:
     """Monitors the FOMO Insurance protocol for events and state changes"""
     
-    def __init__(self, config: MantleConfig, web3: Web3):
+    def __init__(self, config: MantleConfig, web3: AsyncWeb3):
         self.config = config
         self.w3 = web3
         self.contracts = self._load_contracts()
         self.last_block_processed = 0
         
-        # Event signatures for monitoring
-        self.event_signatures = {
-            'PolicyCreated': '0x1234...', # Replace with actual signature
-            'PolicyPurchased': '0x5678...', # Replace with actual signature
-            'PolicySettled': '0x9abc...',  # Replace with actual signature
-        }
+        # Event topics for monitoring
+        self.event_signatures = EVENT_TOPICS
+        
+        # Last snapshot and the block it was read at; event handlers in the same block reuse it
+        self._snapshot_cache: Optional[Tuple[int, ProtocolSnapshot]] = None
         
     def _load_contracts(self):
         """Load FOMO Insurance contract objects"""
-        # Simplified ABI - you'd load the full ABI
-        fomo_abi = [
-            {
-                "anonymous": False,
-                "inputs": [
-                    {"indexed": True, "name": "policyId", "type": "uint256"},
-                    {"indexed": True, "name": "seller", "type": "address"},
-                    {"indexed": True, "name": "token", "type": "address"},
-                    {"indexed": False, "name": "amount", "type": "uint256"},
-                    {"indexed": False, "name": "payoutAmount", "type": "uint256"},
-                    {"indexed": False, "name": "duration", "type": "uint256"},
-                    {"indexed": False, "name": "upsideShareBps", "type": "uint16"}
-                ],
-                "name": "PolicyCreated",
-                "type": "event"
-            }
-        ]
-        
         return {
             'fomo_insurance': self.w3.eth.contract(
                 address=self.config.FOMO_INSURANCE,
-                abi=fomo_abi
+                abi=FOMO_ABI
             ),
             'policy_manager': self.w3.eth.contract(
                 address=self.config.POLICY_MANAGER, 
-                abi=fomo_abi
+                abi=FOMO_ABI
             ),
             'policy_storage': self.w3.eth.contract(
                 address=self.config.POLICY_STORAGE,
-                abi=fomo_abi
+                abi=FOMO_ABI
+            ),
+            'multicall3': self.w3.eth.contract(
+                address=MULTICALL3_ADDRESS,
+                abi=MULTICALL3_ABI
             )
         }
     
+    def invalidate_snapshot(self):
+        """Force the next get_protocol_snapshot to re-read chain state"""
+        self._snapshot_cache = None
+    
     async def get_protocol_snapshot(self) -> ProtocolSnapshot:
-        """Get current state of the FOMO Insurance protocol"""
+        """Get current state of the FOMO Insurance protocol, cached per block"""
         try:
-            # Get open policies
-            open_policy_ids = await self._get_open_policy_ids()
-            open_policies = []
-            for policy_id in open_policy_ids:
-                policy = await self._get_policy_info(policy_id)
-                if policy:
-                    open_policies.append(policy)
+            # Block number, open policy ids and liquidity in one Multicall3 round-trip
+            block_result, ids_result, balance_result = await self.multicall([
+                (MULTICALL3_ADDRESS, GET_BLOCK_NUMBER_SELECTOR),
+                (self.config.POLICY_MANAGER, GET_OPEN_POLICY_IDS_SELECTOR),
+                (self.config.MOCK_USDC, BALANCE_OF_SELECTOR + encode(["address"], [self.config.FOMO_INSURANCE]))
+            ])
+            (block_number,) = decode(["uint256"], block_result[1])
+            if self._snapshot_cache is not None and self._snapshot_cache[0] == block_number:
+                return self._snapshot_cache[1]
+            
+            open_policy_ids = self._decode_open_policy_ids(*ids_result)
+            available_liquidity = self._decode_available_liquidity(*balance_result)
+            
+            # All open policies in a second Multicall3 round-trip
+            open_policies = await self._get_policies(open_policy_ids)
             
             # Get active policies (would need to track separately or query events)
             active_policies = []
             
             # Calculate metrics
             total_reserves_required = sum(p.required_reserve for p in active_policies)
-            available_liquidity = await self._get_available_liquidity()
             
-            return ProtocolSnapshot(
+            snapshot = ProtocolSnapshot(
                 total_policies=len(open_policies) + len(active_policies),
                 active_policies=active_policies,
                 open_policies=open_policies,
                 total_reserves_required=total_reserves_required,
                 available_liquidity=available_liquidity,
                 pending_settlements=[],  # Would calculate based on expiry times
-                timestamp=datetime.now()
+                timestamp=datetime.now(timezone.utc),
+                block_number=block_number
             )
+            self._snapshot_cache = (block_number, snapshot)
+            return snapshot
             
         except Exception as e:
             logger.error(f"Error getting protocol snapshot: {e}")
-            return ProtocolSnapshot(0, [], [], 0.0, 0.0, [], datetime.now())
+            return ProtocolSnapshot(0, [], [], 0.0, 0.0, [], datetime.now(timezone.utc))
     
-    async def _get_open_policy_ids(self) -> List[int]:
-        """Get list of open policy IDs"""
+    async def get_policy_events(self) -> List[Tuple[str, int, Dict]]:
+        """Fetch policy events since the last processed block with a single eth_getLogs call"""
         try:
-            # This would call your PolicyManager contract
-            result = self.contracts['policy_manager'].functions.getOpenPolicyIds().call()
-            return result
+            latest_block = await self.w3.eth.block_number
+            if not self.last_block_processed:
+                # First poll - only watch for events from here on
+                self.last_block_processed = latest_block
+                return []
+            if latest_block <= self.last_block_processed:
+                return []
+            
+            logs = await self.w3.eth.get_logs({
+                'fromBlock': self.last_block_processed + 1,
+                'toBlock': latest_block,
+                'address': [self.config.POLICY_MANAGER, self.config.SETTLEMENT_ENGINE],
+                'topics': [list(EVENT_TOPICS.values())]  # Any of the policy events
+            })
+            self.last_block_processed = latest_block
+            
+        except Exception as e:
+            logger.error(f"Error getting policy events: {e}")
+            return []
+        
+        events = []
+        for log in logs:
+            event_type = TOPIC_EVENTS.get(AsyncWeb3.to_hex(log['topics'][0]))
+            if event_type:
+                # policyId is the first indexed argument of every policy event
+                policy_id = int.from_bytes(log['topics'][1], 'big')
+                events.append((event_type, policy_id, dict(log)))
+        return events
+    
+    async def multicall(self, calls: List[Tuple[str, bytes]]) -> List[Tuple[bool, bytes]]:
+        """Run (target, calldata) reads in a single Multicall3 aggregate3 call; each may fail alone"""
+        return await self.contracts['multicall3'].functions.aggregate3(
+            [(target, True, call_data) for target, call_data in calls]
+        ).call()
+    
+    @staticmethod
+    def _decode_open_policy_ids(success: bool, return_data: bytes) -> List[int]:
+        """Decode a getOpenPolicyIds result"""
+        try:
+            if not success:
+                raise ContractLogicError("getOpenPolicyIds reverted")
+            (policy_ids,) = decode(["uint256[]"], return_data)
+            return list(policy_ids)
         except Exception as e:
             logger.error(f"Error getting open policy IDs: {e}")
             return []
     
-    async def _get_policy_info(self, policy_id: int) -> Optional[PolicyInfo]:
-        """Get detailed information about a policy"""
+    async def _get_policies(self, policy_ids: List[int]) -> List[PolicyInfo]:
+        """Read many policies from PolicyStorage with a single Multicall3 aggregate3 call"""
+        if not policy_ids:
+            return []
+        
+        try:
+            results = await self.multicall([
+                (self.config.POLICY_STORAGE, GET_POLICY_SELECTOR + encode(["uint256"], [policy_id]))
+                for policy_id in policy_ids
+            ])
+        except Exception as e:
+            logger.error(f"Error getting policy info for {len(policy_ids)} policies: {e}")
+            return []
+        
+        policies = [
+            self._decode_policy(policy_id, success, return_data)
+            for policy_id, (success, return_data) in zip(policy_ids, results)
+        ]
+        return [policy for policy in policies if policy]
+    
+    def _decode_policy(self, policy_id: int, success: bool, return_data: bytes) -> Optional[PolicyInfo]:
+        """Decode one getPolicy result into a PolicyInfo"""
+        if not success:
+            logger.error(f"Error getting policy info for {policy_id}: getPolicy reverted")
+            return None
+        
         try:
-            # This would call your PolicyStorage contract
-            policy_data = self.contracts['policy_storage'].functions.getPolicy(policy_id).call()
+            (policy_data,) = decode(GET_POLICY_OUTPUT_TYPES, return_data)
             
             # Convert to PolicyInfo object (adjust based on your contract structure)
             return PolicyInfo(
                 policy_id=policy_id,
-                seller=policy_data[0],
-                buyer=policy_data[1] if policy_data[1] != "0x0000000000000000000000000000000000000000" else None,
-                token=policy_data[2],
+                seller=to_checksum(policy_data[0]),
+                buyer=to_checksum(policy_data[1]) if policy_data[1] != ZERO_ADDRESS else None,
+                token=to_checksum(policy_data[2]),
                 token_symbol=policy_data[3],
                 amount=policy_data[4] / 10**18,  # Adjust decimals
-                payout_token=policy_data[5],
+                payout_token=to_checksum(policy_data[5]),
                 payout_amount=policy_data[6] / 10**6,  # USDC decimals
                 duration=policy_data[7],
                 upside_share_bps=policy_data[8],
@@ -197,22 +403,13 @@ class FOMOInsuranceMonitor:
             logger.error(f"Error getting policy info for {policy_id}: {e}")
             return None
     
-    async def _get_available_liquidity(self) -> float:
-        """Get available liquidity in the vault"""
+    @staticmethod
+    def _decode_available_liquidity(success: bool, return_data: bytes) -> float:
+        """Decode the FOMO Insurance contract's USDC balanceOf result"""
         try:
-            # Get USDC balance of the FOMO Insurance contract
-            usdc_contract = self.w3.eth.contract(
-                address=self.config.MOCK_USDC,
-                abi=[{
-                    "constant": True,
-                    "inputs": [{"name": "_owner", "type": "address"}],
-                    "name": "balanceOf",
-                    "outputs": [{"name": "balance", "type": "uint256"}],
-                    "type": "function"
-                }]
-            )
-            
-            balance_wei = usdc_contract.functions.balanceOf(self.config.FOMO_INSURANCE).call()
+            if not success:
+                raise ContractLogicError("balanceOf reverted")
+            (balance_wei,) = decode(["uint256"], return_data)
             return balance_wei / 10**6  # USDC decimals
             
         except Exception as e:
@@ -234,57 +431,186 @@ class IntegratedMantleVaultAgent(MantleVaultAgent):
         self.fomo_monitor = FOMOInsuranceMonitor(self.config, self.web3_manager.w3)
         self.reserve_ratio = 0.15  # Keep 15% in reserves for policy payouts
         self.last_protocol_snapshot = None
+        self._last_digest: Optional[int] = None  # Digest of the snapshot state and APYs last acted on
+        self._wakeup = asyncio.Event()  # Set to start the next monitoring cycle early
+        self._backoff = 1.0  # Seconds to wait after the next unexpected loop error
+        
+        # Allocation results keyed on every input they depend on; results are shared, treat as read-only
+        self._allocation_cache: OrderedDict[Tuple, Dict] = OrderedDict()
+        
+        # FOMO dashboard section and the snapshot it was built from; rebuilt when the snapshot is replaced
+        self._fomo_dashboard: Optional[Tuple[ProtocolSnapshot, Dict]] = None
+        
+        # Strategy APYs move slowly; reuse them across cycles instead of one RPC per lookup
+        self._apy_cache: Dict[str, Tuple[float, float]] = {}  # name -> (apy, monotonic expiry)
+        
+        # Policy events queue a rebalance trigger; one worker coalesces them per debounce window
+        self._rebalance_triggers: set = set()
+        self._rebalance_worker: Optional[asyncio.Task] = None
+        self._rebalance_lock = asyncio.Lock()
+        self._event_poller: Optional[asyncio.Task] = None
+        
+        # Set by a host (e.g. the API server lifespan) to supervise the poller and rebalance worker
+        self.task_group: Optional[asyncio.TaskGroup] = None
+        
+    async def _cached_apy(self, strategy_name: str) -> float:
+        """Get a strategy APY, refetching only once the cached value is older than APY_TTL_SECONDS"""
+        cached = self._apy_cache.get(strategy_name)
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
         
+        apy = await self.strategy_manager.get_strategy_apy(strategy_name)
+        self._apy_cache[strategy_name] = (apy, time.monotonic() + APY_TTL_SECONDS)
+        return apy
+    
+    async def _cached_apys(self) -> Dict[str, float]:
+        """Get every strategy APY, overlapping the fetches for any that are stale"""
+        apys = await asyncio.gather(*(self._cached_apy(name) for name in STRATEGIES))
+        return dict(zip(STRATEGIES, apys))
+    
     async def enhanced_monitoring_loop(self):
         """Enhanced monitoring that considers FOMO Insurance protocol state"""
+        self.running = True
         logger.info("🚀 Starting Enhanced Mantle Vault Agent with FOMO Integration...")
         
+        # Policy events arrive far more often than the allocation cycle; poll them alongside it
+        if self._event_poller is None or self._event_poller.done():
+            self._event_poller = self._spawn(self._poll_policy_events())
+        
         while self.running:
             try:
-                # Get current protocol state
-                protocol_snapshot = await self.fomo_monitor.get_protocol_snapshot()
+                # Fetch APYs while the protocol state is read; both are independent network work
+                protocol_snapshot, strategy_apys = await asyncio.gather(
+                    self.fomo_monitor.get_protocol_snapshot(),
+                    self._cached_apys()
+                )
                 self.last_protocol_snapshot = protocol_snapshot
                 
+                # Neither protocol state nor APYs changed since the last cycle - skip the allocation math
+                digest = hash((protocol_snapshot.state_digest, tuple(strategy_apys.values())))
+                if digest == self._last_digest and not protocol_snapshot.upcoming_expirations():
+                    logger.info("💤 Protocol state and APYs unchanged, skipping allocation")
+                    await self._wait_next_cycle()
+                    continue
+                
                 # Calculate optimal fund allocation
-                allocation_strategy = await self._calculate_integrated_allocation(protocol_snapshot)
+                allocation_strategy = await self._calculate_integrated_allocation(
+                    protocol_snapshot, strategy_apys
+                )
                 
                 # Execute allocation if needed
                 if allocation_strategy['should_rebalance']:
                     await self._execute_integrated_rebalance(allocation_strategy)
+                self._last_digest = digest
                 
-                # Log status
-                logger.info(f"📊 Protocol Status: {len(protocol_snapshot.active_policies)} active policies, "
-                           f"${protocol_snapshot.total_reserves_required:,.2f} reserves required")
+                # Log status (skip the formatting entirely when INFO is filtered out)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"📊 Protocol Status: {len(protocol_snapshot.active_policies)} active policies, "
+                               f"${protocol_snapshot.total_reserves_required:,.2f} reserves required")
+                
+                self._backoff = 1.0
                 
                 # Wait for next cycle
-                await asyncio.sleep(self.config.DELTA_T_HOURS * 3600)
+                await self._wait_next_cycle()
                 
+            # CancelledError is a BaseException and propagates past these handlers on shutdown
+            except (Web3RPCError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"RPC error in enhanced monitoring loop, retrying in {RPC_ERROR_BACKOFF:.0f}s: {e}")
+                await asyncio.sleep(RPC_ERROR_BACKOFF)
             except Exception as e:
-                logger.error(f"Error in enhanced monitoring loop: {e}")
-                await asyncio.sleep(60)
+                self._backoff = min(self._backoff * 2, MAX_ERROR_BACKOFF)
+                logger.error(f"Error in enhanced monitoring loop, retrying in {self._backoff:.0f}s: {e}")
+                await asyncio.sleep(self._backoff)
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a background task in the host's TaskGroup when one is attached"""
+        if self.task_group is not None:
+            return self.task_group.create_task(coro)
+        return asyncio.create_task(coro)
+    
+    async def _poll_policy_events(self):
+        """Feed new policy events to handle_policy_event until monitoring stops"""
+        while self.running:
+            for event_type, policy_id, event_data in await self.fomo_monitor.get_policy_events():
+                try:
+                    await self.handle_policy_event(event_type, policy_id, event_data)
+                except Exception as e:
+                    logger.error(f"Error handling {event_type} for policy {policy_id}: {e}")
+            await asyncio.sleep(POLICY_EVENT_POLL_INTERVAL)
     
-    async def _calculate_integrated_allocation(self, snapshot: ProtocolSnapshot) -> Dict:
-        """Calculate optimal allocation considering FOMO Insurance requirements"""
+    async def _wait_next_cycle(self):
+        """Sleep for a jittered cycle interval, returning early if the loop is woken"""
+        interval = self.config.DELTA_T_HOURS * 3600
+        interval *= random.uniform(1 - MONITOR_INTERVAL_JITTER, 1 + MONITOR_INTERVAL_JITTER)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+    
+    def wake_monitoring(self):
+        """Start the next monitoring cycle now instead of after the interval"""
+        self._wakeup.set()
+    
+    def stop_monitoring(self):
+        """Stop the agent monitoring without waiting out the current cycle interval"""
+        super().stop_monitoring()
+        self.wake_monitoring()
         
-        # Base allocation calculation
+        # Drop the event poller and queued event-driven rebalances along with the loop
+        if self._event_poller is not None:
+            self._event_poller.cancel()
+            self._event_poller = None
+        self._rebalance_triggers.clear()
+        if self._rebalance_worker is not None:
+            self._rebalance_worker.cancel()
+            self._rebalance_worker = None
+    
+    @staticmethod
+    def _reserve_position(snapshot: ProtocolSnapshot) -> Tuple[float, float, float]:
+        """Safety buffer, deployable funds and reserve ratio for a snapshot - no RPC involved"""
         total_funds = snapshot.available_liquidity
-        required_reserves = snapshot.total_reserves_required
         
         # Ensure we have enough reserves + buffer
-        safety_buffer = required_reserves * 0.2  # 20% safety buffer
-        total_reserves_needed = required_reserves + safety_buffer
+        safety_buffer = snapshot.total_reserves_required * 0.2  # 20% safety buffer
+        total_reserves_needed = snapshot.total_reserves_required + safety_buffer
         
         # Available funds for strategies
         deployable_funds = max(0, total_funds - total_reserves_needed)
         
         # Calculate reserve ratio
         current_reserve_ratio = total_reserves_needed / total_funds if total_funds > 0 else 0
+        return safety_buffer, deployable_funds, current_reserve_ratio
+    
+    async def _calculate_integrated_allocation(self, snapshot: ProtocolSnapshot,
+                                               strategy_apys: Optional[Dict[str, float]] = None) -> Dict:
+        """Calculate optimal allocation considering FOMO Insurance requirements, memoized per block on its inputs"""
         
-        # Get strategy APYs
-        strategy_apys = {}
-        for strategy_name in ["init_looping", "circuit_vault", "mnt_staking"]:
-            apy = await self.strategy_manager.get_strategy_apy(strategy_name)
-            strategy_apys[strategy_name] = apy
+        # Get strategy APYs unless the caller already fetched them
+        if strategy_apys is None:
+            strategy_apys = await self._cached_apys()
+        upcoming_expirations = snapshot.upcoming_expirations(3600)  # 1 hour
+        
+        key = (snapshot.block_number, snapshot.state_key, upcoming_expirations, tuple(strategy_apys.values()))
+        allocation_strategy = self._allocation_cache.get(key)
+        if allocation_strategy is not None:
+            self._allocation_cache.move_to_end(key)
+            return allocation_strategy
+        
+        allocation_strategy = self._allocation_for(snapshot, strategy_apys, upcoming_expirations)
+        self._allocation_cache[key] = allocation_strategy
+        if len(self._allocation_cache) > ALLOCATION_CACHE_SIZE:
+            self._allocation_cache.popitem(last=False)
+        return allocation_strategy
+    
+    def _allocation_for(self, snapshot: ProtocolSnapshot, strategy_apys: Dict[str, float],
+                        upcoming_expirations: int) -> Dict:
+        """Pure allocation math for a snapshot and its strategy APYs"""
+        
+        # Base allocation calculation
+        total_funds = snapshot.available_liquidity
+        required_reserves = snapshot.total_reserves_required
+        safety_buffer, deployable_funds, current_reserve_ratio = self._reserve_position(snapshot)
         
         # Determine if rebalancing is needed
         should_rebalance = False
@@ -296,40 +622,36 @@ class IntegratedMantleVaultAgent(MantleVaultAgent):
             reasons.append("Insufficient reserves for policy coverage")
         
         # Check for significant APY changes
-        apy_spread = max(strategy_apys.values()) - min(strategy_apys.values())
+        # Exactly three strategies - compare scalars instead of two passes over values()
+        a, b, c = strategy_apys.values()
+        lo, hi = (a, b) if a < b else (b, a)
+        if c < lo:
+            lo = c
+        elif c > hi:
+            hi = c
+        apy_spread = hi - lo
         if apy_spread > self.config.MIN_REALLOCATION_THRESHOLD:
             should_rebalance = True
             reasons.append(f"APY spread of {apy_spread:.2f}% detected")
         
         # Check for upcoming policy expirations (might free up reserves)
-        upcoming_expirations = [p for p in snapshot.active_policies 
-                              if p.time_to_expiry and p.time_to_expiry < 3600]  # 1 hour
         if upcoming_expirations:
             should_rebalance = True
-            reasons.append(f"{len(upcoming_expirations)} policies expiring soon")
+            reasons.append(f"{upcoming_expirations} policies expiring soon")
         
         # Calculate optimal strategy allocation for deployable funds
         if deployable_funds > 0:
             # Risk-adjusted allocation based on policy activity
-            risk_multiplier = 1.0
-            if len(snapshot.active_policies) > 10:  # High policy activity
-                risk_multiplier = 0.8  # More conservative
-            elif len(snapshot.active_policies) < 3:  # Low policy activity
-                risk_multiplier = 1.2  # More aggressive
-            
-            # Base allocation percentages
-            base_allocation = {
-                "init_looping": 0.45 * risk_multiplier,
-                "circuit_vault": 0.35,
-                "mnt_staking": 0.20
-            }
-            
-            # Normalize allocations
-            total_allocation = sum(base_allocation.values())
-            optimal_allocation = {k: (v / total_allocation) * 100 
-                                for k, v in base_allocation.items()}
+            n_active = len(snapshot.active_policies)
+            if n_active > 10:
+                tier = "high"
+            elif n_active < 3:
+                tier = "low"
+            else:
+                tier = "mid"
+            optimal_allocation = ALLOCATION_TABLES[tier]
         else:
-            optimal_allocation = {"init_looping": 0, "circuit_vault": 0, "mnt_staking": 0}
+            optimal_allocation = NO_ALLOCATION
         
         return {
             "should_rebalance": should_rebalance,
@@ -341,40 +663,65 @@ class IntegratedMantleVaultAgent(MantleVaultAgent):
             "current_reserve_ratio": current_reserve_ratio,
             "strategy_apys": strategy_apys,
             "optimal_allocation": optimal_allocation,
-            "upcoming_expirations": len(upcoming_expirations)
+            "upcoming_expirations": upcoming_expirations
         }
     
     async def _execute_integrated_rebalance(self, strategy: Dict):
         """Execute rebalancing with FOMO Insurance considerations"""
-        logger.info(f"🔄 Executing integrated rebalance. Reasons: {', '.join(strategy['reasons'])}")
-        
-        try:
-            # First, ensure adequate reserves
-            await self._ensure_adequate_reserves(strategy['required_reserves'] + strategy['safety_buffer'])
+        # The monitoring loop and the event-driven worker both rebalance; never let their legs overlap
+        waited = self._rebalance_lock.locked()
+        async with self._rebalance_lock:
+            logger.info(f"🔄 Executing integrated rebalance. Reasons: {', '.join(strategy['reasons'])}")
             
-            # Then allocate remaining funds to strategies
-            if strategy['deployable_funds'] > 0:
-                for strategy_name, allocation_pct in strategy['optimal_allocation'].items():
-                    if allocation_pct > 0:
-                        amount = (strategy['deployable_funds'] * allocation_pct) / 100
-                        result = await self.strategy_manager.deploy_to_strategy(strategy_name, amount)
-                        
-                        if result['success']:
+            try:
+                # First, ensure adequate reserves
+                # total_funds is the snapshot's read of the same USDC balance - no need to fetch it again,
+                # unless another rebalance ran while this one waited for the lock
+                await self._ensure_adequate_reserves(
+                    strategy['required_reserves'] + strategy['safety_buffer'],
+                    None if waited else strategy['total_funds']
+                )
+                
+                # Then allocate remaining funds to strategies
+                if strategy['deployable_funds'] > 0:
+                    deployments = {
+                        strategy_name: (strategy['deployable_funds'] * allocation_pct) / 100
+                        for strategy_name, allocation_pct in zip(Allocation._fields, strategy['optimal_allocation'])
+                        if allocation_pct > 0
+                    }
+                    
+                    # Deploys are independent; send_transaction serializes nonces, so broadcast them concurrently
+                    results = await asyncio.gather(
+                        *[self.strategy_manager.deploy_to_strategy(name, amount) for name, amount in deployments.items()],
+                        return_exceptions=True
+                    )
+                    
+                    for (strategy_name, amount), result in zip(deployments.items(), results):
+                        if isinstance(result, Exception):
+                            logger.error(f"❌ Failed to deploy to {strategy_name}: {result}")
+                        elif result['success']:
                             logger.info(f"✅ Deployed ${amount:,.2f} to {strategy_name}")
                         else:
                             logger.error(f"❌ Failed to deploy to {strategy_name}: {result['error']}")
+                
+                # Update vault state
+                self.vault_state.last_rebalance_ts = time.monotonic()
+                
+                # Deployments move strategy APYs; refetch on the next cycle
+                self._apy_cache.clear()
+                self.strategy_manager.clear_apy_cache()
+                
+                logger.info("✅ Integrated rebalance completed successfully")
             
-            # Update vault state
-            self.vault_state.last_rebalance = datetime.now()
-            
-            logger.info("✅ Integrated rebalance completed successfully")
-            
-        except Exception as e:
-            logger.error(f"❌ Error executing integrated rebalance: {e}")
+            except Exception as e:
+                logger.error(f"❌ Error executing integrated rebalance: {e}")
     
-    async def _ensure_adequate_reserves(self, required_amount: float):
+    async def _ensure_adequate_reserves(self, required_amount: float, current_balance: Optional[float] = None):
         """Ensure adequate reserves are available for policy payouts"""
-        current_balance = self.web3_manager.get_balance("USDC", self.config.FOMO_INSURANCE)
+        if current_balance is None:
+            current_balance = self.web3_manager.to_human(
+                "USDC", await self.web3_manager.get_balance("USDC", self.config.FOMO_INSURANCE)
+            )
         
         if current_balance < required_amount:
             shortfall = required_amount - current_balance
@@ -382,24 +729,66 @@ class IntegratedMantleVaultAgent(MantleVaultAgent):
             
             # Withdraw from strategies to cover shortfall
             # Start with lowest APY strategy first
-            strategies_by_apy = sorted(
-                [(name, await self.strategy_manager.get_strategy_apy(name)) 
-                 for name in ["init_looping", "circuit_vault", "mnt_staking"]],
-                key=lambda x: x[1]
-            )
+            strategy_apys = await self._cached_apys()
+            candidates = [name for name, _ in sorted(strategy_apys.items(), key=lambda x: x[1])]
             
+            # One concurrent round over the planned split, then one round re-issuing any residual
+            # against the strategies that didn't fail. The per-strategy cap holds across both rounds
+            limit = shortfall * 0.5  # Conservative withdrawal
+            withdrawn: Dict[str, float] = {}
             remaining_shortfall = shortfall
-            for strategy_name, apy in strategies_by_apy:
-                if remaining_shortfall <= 0:
+            for _ in range(2):
+                plan = self._plan_withdrawals(candidates, remaining_shortfall, limit, withdrawn)
+                if not plan:
                     break
                 
-                # Withdraw up to the remaining shortfall
-                withdraw_amount = min(remaining_shortfall, shortfall * 0.5)  # Conservative withdrawal
-                result = await self.strategy_manager.withdraw_from_strategy(strategy_name, withdraw_amount)
+                results = await asyncio.gather(
+                    *[self.strategy_manager.withdraw_from_strategy(name, amount) for name, amount in plan.items()],
+                    return_exceptions=True
+                )
                 
-                if result['success']:
+                failed = set()
+                for (strategy_name, withdraw_amount), result in zip(plan.items(), results):
+                    if isinstance(result, Exception) or not result['success']:
+                        failed.add(strategy_name)
+                        continue
                     remaining_shortfall -= withdraw_amount
+                    withdrawn[strategy_name] = withdrawn.get(strategy_name, 0.0) + withdraw_amount
                     logger.info(f"💸 Withdrew ${withdraw_amount:,.2f} from {strategy_name}")
+                
+                candidates = [
+                    name for name in candidates
+                    if name not in failed and withdrawn.get(name, 0.0) < limit
+                ]
+            
+            if remaining_shortfall > 0:
+                logger.warning(f"⚠️ Reserve shortfall of ${remaining_shortfall:,.2f} remains after withdrawals")
+    
+    @staticmethod
+    def _plan_withdrawals(candidates: List[str], amount: float, limit: float,
+                          withdrawn: Dict[str, float]) -> Dict[str, float]:
+        """Split a withdrawal across strategies in order, keeping each strategy's total under limit
+        
+        A retry after one strategy failed only tops up the others to their remaining room:
+        
+        >>> plan = IntegratedMantleVaultAgent._plan_withdrawals
+        >>> plan(["aave", "moe", "lendle"], 100.0, 50.0, {})
+        {'aave': 50.0, 'moe': 50.0}
+        >>> plan(["lendle"], 50.0, 50.0, {"aave": 50.0})  # moe failed, aave is used up
+        {'lendle': 50.0}
+        >>> plan(["aave", "lendle"], 60.0, 50.0, {"aave": 30.0})
+        {'aave': 20.0, 'lendle': 40.0}
+        """
+        plan = {}
+        for strategy_name in candidates:
+            if amount <= 0:
+                break
+            withdraw_amount = min(amount, limit - withdrawn.get(strategy_name, 0.0))
+            if withdraw_amount <= 0:
+                continue
+            plan[strategy_name] = withdraw_amount
+            amount -= withdraw_amount
+        return plan
     
     async def handle_policy_event(self, event_type: str, policy_id: int, event_data: Dict):
         """Handle specific FOMO Insurance policy events"""
@@ -409,63 +798,87 @@ class IntegratedMantleVaultAgent(MantleVaultAgent):
             # New policy created - might affect allocation
             await self._on_policy_created(policy_id, event_data)
             
-        elif event_type == "PolicyPurchased":
-            # Policy purchased - reserves now needed
-            await self._on_policy_purchased(policy_id, event_data)
-            
         elif event_type == "PolicySettled":
             # Policy settled - reserves freed up
             await self._on_policy_settled(policy_id, event_data)
+            
+        elif event_type == "PolicyCancelled":
+            # Open policy withdrawn - its collateral no longer counts
+            await self._on_policy_cancelled(policy_id, event_data)
     
     async def _on_policy_created(self, policy_id: int, event_data: Dict):
         """Handle new policy creation"""
-        # Policy is now open for purchase - no immediate action needed
+        # Policy is now open for purchase - no rebalance needed; the next regular cycle picks it up
         logger.info(f"📋 New policy {policy_id} created and available for purchase")
+        self.fomo_monitor.invalidate_snapshot()
+        self._last_digest = None
     
-    async def _on_policy_purchased(self, policy_id: int, event_data: Dict):
-        """Handle policy purchase - increase reserves"""
-        policy = await self.fomo_monitor._get_policy_info(policy_id)
-        if policy:
-            logger.info(f"💼 Policy {policy_id} purchased - reserving ${policy.payout_amount:,.2f}")
-            
-            # Trigger rebalance to ensure adequate reserves
-            snapshot = await self.fomo_monitor.get_protocol_snapshot()
-            allocation_strategy = await self._calculate_integrated_allocation(snapshot)
-            
-            if allocation_strategy['current_reserve_ratio'] < self.reserve_ratio:
-                await self._execute_integrated_rebalance(allocation_strategy)
+    async def _on_policy_cancelled(self, policy_id: int, event_data: Dict):
+        """Handle policy cancellation - refresh the snapshot right away"""
+        logger.info(f"🚫 Policy {policy_id} cancelled - refreshing protocol snapshot")
+        self.fomo_monitor.invalidate_snapshot()
+        self.wake_monitoring()
     
     async def _on_policy_settled(self, policy_id: int, event_data: Dict):
         """Handle policy settlement - free up reserves"""
         logger.info(f"✅ Policy {policy_id} settled - reserves freed for reallocation")
         
-        # Trigger rebalance to reallocate freed reserves
-        snapshot = await self.fomo_monitor.get_protocol_snapshot()
-        allocation_strategy = await self._calculate_integrated_allocation(snapshot)
+        # Settlement changes reserve state - don't reuse a snapshot from earlier in this block
+        self.fomo_monitor.invalidate_snapshot()
         
-        if allocation_strategy['deployable_funds'] > 1000:  # Minimum threshold
-            await self._execute_integrated_rebalance(allocation_strategy)
+        # Trigger rebalance to reallocate freed reserves
+        self._schedule_rebalance("PolicySettled")
+    
+    def _schedule_rebalance(self, trigger: str):
+        """Queue an event-driven rebalance; triggers arriving within the debounce window coalesce"""
+        self._rebalance_triggers.add(trigger)
+        if self._rebalance_worker is None or self._rebalance_worker.done():
+            self._rebalance_worker = self._spawn(self._run_rebalance_worker())
+    
+    async def _run_rebalance_worker(self):
+        """Run one rebalance per debounce window until no triggers are pending"""
+        while self._rebalance_triggers:
+            await asyncio.sleep(REBALANCE_DEBOUNCE_SECONDS)
+            triggers, self._rebalance_triggers = self._rebalance_triggers, set()
+            
+            try:
+                snapshot = await self.fomo_monitor.get_protocol_snapshot()
+                _, deployable_funds, _ = self._reserve_position(snapshot)
+                
+                # Settlements free funds worth redeploying; the check comes from the snapshot alone,
+                # so the full allocation only runs when needed
+                if "PolicySettled" in triggers and deployable_funds > 1000:  # Minimum threshold
+                    allocation_strategy = await self._calculate_integrated_allocation(snapshot)
+                    await self._execute_integrated_rebalance(allocation_strategy)
+            except Exception as e:
+                logger.error(f"Error in event-driven rebalance: {e}")
     
     async def get_integrated_dashboard_data(self) -> Dict:
         """Get comprehensive dashboard data including FOMO Insurance metrics"""
         base_data = await super().get_dashboard_data()
         
         if self.last_protocol_snapshot:
-            fomo_data = {
-                "total_policies": self.last_protocol_snapshot.total_policies,
-                "active_policies": len(self.last_protocol_snapshot.active_policies),
-                "open_policies": len(self.last_protocol_snapshot.open_policies),
-                "total_reserves_required": self.last_protocol_snapshot.total_reserves_required,
-                "available_liquidity": self.last_protocol_snapshot.available_liquidity,
-                "reserve_ratio": (self.last_protocol_snapshot.total_reserves_required / 
-                                self.last_protocol_snapshot.available_liquidity 
-                                if self.last_protocol_snapshot.available_liquidity > 0 else 0),
-                "pending_settlements": len(self.last_protocol_snapshot.pending_settlements)
-            }
-            
-            base_data["fomo_insurance"] = fomo_data
+            base_data["fomo_insurance"] = dict(self._fomo_dashboard_data(self.last_protocol_snapshot))
         
         return base_data
+    
+    def _fomo_dashboard_data(self, snapshot: ProtocolSnapshot) -> Dict:
+        """FOMO Insurance dashboard metrics, built once per snapshot (snapshots are immutable)"""
+        if self._fomo_dashboard is not None and self._fomo_dashboard[0] is snapshot:
+            return self._fomo_dashboard[1]
+        
+        fomo_data = {
+            "total_policies": snapshot.total_policies,
+            "active_policies": len(snapshot.active_policies),
+            "open_policies": len(snapshot.open_policies),
+            "total_reserves_required": snapshot.total_reserves_required,
+            "available_liquidity": snapshot.available_liquidity,
+            "reserve_ratio": (snapshot.total_reserves_required / snapshot.available_liquidity
+                            if snapshot.available_liquidity > 0 else 0),
+            "pending_settlements": len(snapshot.pending_settlements)
+        }
+        self._fomo_dashboard = (snapshot, fomo_data)
+        return fomo_data
 
 # ==============================================================================
 # MAIN INTEGRATION RUNNER
@@ -476,6 +889,8 @@ async def run_integrated_agent():
     
     # Initialize the integrated agent
     agent = IntegratedMantleVaultAgent()
+    await agent.web3_manager.use_shared_session()
+    await agent.setup()
     
     logger.info("🎯 Starting Integrated Mantle Vault Agent with FOMO Insurance support")
     logger.info(f"📊 Monitoring contracts:")
@@ -492,6 +907,9 @@ async def run_integrated_agent():
         agent.stop_monitoring()
     except Exception as e:
         logger.error(f"❌ Error running integrated agent: {e}")
+    finally:
+        await agent.close()
+        await close_session()
 
 if __name__ == "__main__":
     # Configure logging
@@ -0,0 +1,58 @@
+"""
+Shared HTTP client for the Mantle Vault Agent
+
+All protocol and price API clients reuse one aiohttp.ClientSession so every
+fetch cycle shares a single keep-alive connection pool instead of opening
+fresh TCP/TLS connections per client.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# ==============================================================================
+# SHARED SESSION
+# ==============================================================================
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, creating it on first use inside the running loop"""
+    global _session
+
+    if _session is not None and not _session.closed:
+        return _session
+
+    async with _session_lock:
+        if _session is None or _session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                enable_cleanup_closed=True,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            _session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'Accept-Encoding': 'gzip, deflate',
+                    'User-Agent': 'mantle-vault-agent/1.0'
+                },
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+            logger.info("Created shared HTTP session")
+    return _session
+
+async def close_session():
+    """Close the shared HTTP session (call once on shutdown)"""
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -2,29 +2,46 @@ import os
 import json
 import time
 import asyncio
+import contextlib
+import functools
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from typing import Annotated, Dict, List, Optional, Sequence, Tuple, Any
+from dataclasses import dataclass, asdict, field, fields
+from datetime import datetime, timedelta, timezone
 import logging
 
 # Web3 and DeFi
-from web3 import Web3
-from web3.exceptions import ContractLogicError
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3.exceptions import ContractLogicError, TimeExhausted, TransactionNotFound
 import requests
+import anyio.to_thread
+
+from http_client import get_session
 
 # LangChain and LangGraph
 from langchain_openai import ChatOpenAI
 from langchain.tools import tool
 from langchain_core.prompts import PromptTemplate
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage, RemoveMessage
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph.message import add_messages, REMOVE_ALL_MESSAGES
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.cache.memory import InMemoryCache
+from langgraph.types import CachePolicy
 from typing_extensions import TypedDict
 
 # Environment and utilities
 from dotenv import load_dotenv
 import numpy as np
+import orjson
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to plain Python kernels
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,10 +50,21 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Shared generator for mock data; set AGENT_RNG_SEED for reproducible runs
+_rng = np.random.default_rng(int(os.getenv("AGENT_RNG_SEED", "0")) or None)
+
+# Give up on a transaction receipt after this long (same default as web3's wait_for_transaction_receipt)
+RECEIPT_TIMEOUT = 120.0  # seconds
+
 # ==============================================================================
 # CONFIGURATION AND CONSTANTS
 # ==============================================================================
 
+@functools.lru_cache(maxsize=256)
+def to_checksum(address: str) -> str:
+    """Checksum an address once; repeated lookups skip the keccak256"""
+    return AsyncWeb3.to_checksum_address(address)
+
 @dataclass
 class MantleConfig:
     """Configuration for Mantle Network and contracts"""
@@ -63,51 +91,115 @@ class MantleConfig:
     # Agent Configuration
     DELTA_T_HOURS: int = 6  # Time window for APY tracking
     MIN_REALLOCATION_THRESHOLD: float = 0.5  # 0.5% APY difference
+    REBALANCE_APY_SPREAD: float = 1.0  # 1% APY spread makes the agent loop rebalance
     MAX_SLIPPAGE: float = 0.02  # 2% max slippage
     SAFETY_BUFFER: float = 0.1  # 10% safety buffer
+    CHECKPOINT_DB: str = "agent_state.db"  # SQLite file for LangGraph checkpoints
+    
+    def __post_init__(self):
+        # Normalize every contract address to checksum form once, at load
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, str) and value.startswith("0x") and len(value) == 42:
+                setattr(self, f.name, to_checksum(value))
+
+@njit(cache=True)
+def _weighted_sum(values, weights):
+    """Dot product of two float64 arrays"""
+    total = 0.0
+    for i in range(values.shape[0]):
+        total += values[i] * weights[i]
+    return total
+
+# Fixed strategy ordering used to index StrategyTable arrays
+STRATEGIES = ("init_looping", "circuit_vault", "mnt_staking")
+
+# Mock risk scores, in STRATEGIES order
+STRATEGY_RISK_SCORES = np.array([0.7, 0.4, 0.2])  # Leverage, medium, low
+
+# Base allocation fractions per risk profile, in STRATEGIES order
+RISK_PROFILE_ALLOCATIONS = {
+    "conservative": np.array([0.2, 0.5, 0.3]),
+    "moderate": np.array([0.4, 0.4, 0.2]),
+    "aggressive": np.array([0.6, 0.3, 0.1])
+}
+
+def _strategy_array() -> np.ndarray:
+    """Zeroed float64 array with one slot per strategy"""
+    return np.zeros(len(STRATEGIES), dtype=np.float64)
 
 @dataclass
-class StrategyData:
-    """Data structure for strategy information"""
-    name: str
-    address: str
-    current_apy: float
-    historical_apy: List[float]
-    tvl: float
-    allocation: float
-    risk_score: float
-    last_updated: datetime
-    
-    def get_average_apy(self, window_hours: int = 24) -> float:
-        """Get average APY over specified window"""
-        if not self.historical_apy:
-            return self.current_apy
-        return sum(self.historical_apy[-window_hours:]) / len(self.historical_apy[-window_hours:])
+class StrategyTable:
+    """Struct-of-arrays view of per-strategy metrics, indexed in STRATEGIES order"""
+    apys: np.ndarray = field(default_factory=_strategy_array)
+    risks: np.ndarray = field(default_factory=lambda: STRATEGY_RISK_SCORES.copy())
+    allocs: np.ndarray = field(default_factory=_strategy_array)  # Allocation percentages
+    
+    def as_dict(self, values: np.ndarray) -> Dict[str, float]:
+        """Map an array in STRATEGIES order back to strategy names"""
+        return dict(zip(STRATEGIES, values.tolist()))
+
+# Maps time.monotonic() readings to wall-clock time; captured once so later clock jumps don't skew it
+_WALL_CLOCK_OFFSET = time.time() - time.monotonic()
 
 @dataclass 
 class VaultState:
     """Current state of the vault"""
-    total_value: float
-    available_balance: float
-    strategies: Dict[str, StrategyData]
-    last_rebalance: datetime
+    total_value: int  # Base units (wei) of the vault's deposit token
+    available_balance: int  # Base units (wei) of the vault's deposit token
+    strategies: StrategyTable
+    last_rebalance_ts: float  # time.monotonic() of the last rebalance
     performance_metrics: Dict[str, Any]
     pending_policies: List[Dict]
+    
+    @property
+    def last_rebalance(self) -> datetime:
+        """Wall-clock time of the last rebalance, converted only when read"""
+        return datetime.fromtimestamp(_WALL_CLOCK_OFFSET + self.last_rebalance_ts, timezone.utc)
 
 # ==============================================================================
 # WEB3 AND CONTRACT SETUP
 # ==============================================================================
 
+# 4-byte selector for ERC20 balanceOf(address)
+BALANCE_OF_SELECTOR = AsyncWeb3.keccak(text="balanceOf(address)")[:4]
+
+@functools.lru_cache(maxsize=64)
+def _balance_of_calldata(address: str) -> bytes:
+    """ABI-encoded balanceOf(address) call data: selector + left-padded address"""
+    return BALANCE_OF_SELECTOR + bytes(12) + bytes.fromhex(address[2:])
+
+# Worker threads reserved for blocking web3 work (signing, any sync provider call).
+# Any new blocking call must go through _rpc_limiter instead of the default pool.
+_rpc_limiter = anyio.to_thread.CapacityLimiter(16)
+
 class MantleWeb3Manager:
     """Manages Web3 connections and contract interactions for Mantle Network"""
     
     def __init__(self, config: MantleConfig):
         self.config = config
-        self.w3 = Web3(Web3.HTTPProvider(config.RPC_URL))
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(config.RPC_URL))
         self.agent_account = self.w3.eth.account.from_key(os.getenv("AGENT_PRIVATE_KEY"))
         self.contracts = {}
         self._load_contracts()
         
+        # Shared new-block notification for pending receipt waiters
+        self._new_block = asyncio.Event()
+        self._block_watcher: Optional[asyncio.Task] = None
+        self._pending_receipts = 0
+        
+        # Gas price is cached for one block; nonce is tracked locally after the first fetch
+        self._gas_price_cache: Tuple[float, int] = (float("-inf"), 0)
+        self._nonce: Optional[int] = None
+        self._nonce_lock = asyncio.Lock()
+        
+        # Balances are reused within one block: (token, address) -> (block bucket, balance)
+        self._balance_cache: Dict[Tuple[str, str], Tuple[int, int]] = {}
+    
+    async def use_shared_session(self):
+        """Send JSON-RPC requests over the shared keep-alive HTTP session"""
+        await self.w3.provider.cache_async_session(await get_session())
+        
     def _load_contracts(self):
         """Load contract ABIs and create contract objects"""
         # Load ABIs (simplified for demo - you'd load from actual ABI files)
@@ -148,34 +240,143 @@ class MantleWeb3Manager:
             "MNT": self.w3.eth.contract(address=self.config.MOCK_MNT, abi=erc20_abi),
         }
         
-    def get_balance(self, token: str, address: str = None) -> float:
-        """Get token balance for address"""
+        # Base units per whole token, keyed like self.contracts
+        self._decimals = {"USDC": 10**6, "WETH": 10**18, "MNT": 10**18}
+        
+    def to_human(self, token: str, amount: int) -> float:
+        """Convert a base-unit token amount to a display value"""
+        return amount / self._decimals[token]
+    
+    async def get_balance(self, token: str, address: str = None) -> int:
+        """Get token balance for address in base units (wei)"""
         if address is None:
             address = self.agent_account.address
             
         if token in self.contracts:
-            balance_wei = self.contracts[token].functions.balanceOf(address).call()
-            return balance_wei / (10**18 if token in ["WETH", "MNT"] else 10**6)
-        return 0.0
+            bucket = int(time.monotonic() // self.config.BLOCK_TIME)
+            cached = self._balance_cache.get((token, address))
+            if cached and cached[0] == bucket:
+                return cached[1]
+            
+            result = await self.w3.eth.call({
+                "to": self.contracts[token].address,
+                "data": _balance_of_calldata(address)
+            })
+            balance = int.from_bytes(result, "big")
+            self._balance_cache[(token, address)] = (bucket, balance)
+            return balance
+        return 0
+    
+    async def read_tick_state(self, token: str, address: str) -> int:
+        """Read a token balance, the agent's nonce and the gas price in one batched JSON-RPC request.
+        
+        Warms the balance, nonce and gas price caches so sends later in the tick skip those reads.
+        """
+        async with self.w3.batch_requests() as batch:
+            batch.add(self.w3.eth.call({
+                "to": self.contracts[token].address,
+                "data": _balance_of_calldata(address)
+            }))
+            batch.add(self.w3.eth.get_transaction_count(self.agent_account.address))
+            batch.add(self.w3.eth.gas_price)
+            raw_balance, nonce, gas_price = await batch.async_execute()
+        
+        now = time.monotonic()
+        balance = int.from_bytes(raw_balance, "big")
+        self._balance_cache[(token, address)] = (int(now // self.config.BLOCK_TIME), balance)
+        self._gas_price_cache = (now, gas_price)
+        # Only seed the nonce; once tracked locally (or mid-send) the local value is authoritative
+        if self._nonce is None and not self._nonce_lock.locked():
+            self._nonce = nonce
+        return balance
     
-    def send_transaction(self, tx_func, *args, **kwargs):
+    async def send_transaction(self, tx_func, *args, **kwargs):
         """Send a transaction with proper gas estimation"""
         try:
-            tx = tx_func(*args, **kwargs).build_transaction({
-                'from': self.agent_account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.agent_account.address),
-                'gas': 500_000,
-                'gasPrice': self.w3.eth.gas_price,
-                'chainId': self.config.CHAIN_ID
-            })
+            gas_price = await self._get_gas_price()
+            
+            # Hold the lock from nonce assignment through broadcast so concurrent sends stay ordered
+            async with self._nonce_lock:
+                if self._nonce is None:
+                    self._nonce = await self.w3.eth.get_transaction_count(self.agent_account.address)
+                
+                tx = await tx_func(*args, **kwargs).build_transaction({
+                    'from': self.agent_account.address,
+                    'nonce': self._nonce,
+                    'gas': 500_000,
+                    'gasPrice': gas_price,
+                    'chainId': self.config.CHAIN_ID
+                })
+                
+                signed_tx = await anyio.to_thread.run_sync(
+                    lambda: self.w3.eth.account.sign_transaction(tx, self.agent_account.key),
+                    limiter=_rpc_limiter
+                )
+                try:
+                    tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+                except Exception:
+                    # Local nonce may be stale - resync from the node on the next send
+                    self._nonce = None
+                    raise
+                self._nonce += 1
+            
+            receipt = await self._wait_receipt(tx_hash)
             
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.agent_account.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            # Our own transfer just landed - cached balances may be stale
+            self._balance_cache.clear()
             
             return {"success": True, "tx_hash": tx_hash.hex(), "receipt": receipt}
         except Exception as e:
             return {"success": False, "error": str(e)}
+    
+    async def _get_gas_price(self) -> int:
+        """Get gas price, reusing the cached value for up to one block"""
+        cached_at, gas_price = self._gas_price_cache
+        if time.monotonic() - cached_at < self.config.BLOCK_TIME:
+            return gas_price
+        
+        gas_price = await self.w3.eth.gas_price
+        self._gas_price_cache = (time.monotonic(), gas_price)
+        return gas_price
+    
+    async def _wait_receipt(self, tx_hash):
+        """Wait for a transaction receipt, re-checking only when a new block arrives (up to RECEIPT_TIMEOUT)"""
+        self._pending_receipts += 1
+        if self._block_watcher is None or self._block_watcher.done():
+            self._block_watcher = asyncio.create_task(self._watch_blocks())
+        
+        try:
+            async with asyncio.timeout(RECEIPT_TIMEOUT):
+                while True:
+                    new_block = self._new_block
+                    try:
+                        return await self.w3.eth.get_transaction_receipt(tx_hash)
+                    except TransactionNotFound:
+                        await new_block.wait()
+        except TimeoutError:
+            raise TimeExhausted(
+                f"Transaction {tx_hash.hex()} is not in the chain after {RECEIPT_TIMEOUT:.0f} seconds"
+            )
+        finally:
+            self._pending_receipts -= 1
+    
+    async def _watch_blocks(self):
+        """Poll the block number once per block and wake every pending receipt waiter"""
+        last_block = None
+        while self._pending_receipts > 0:
+            try:
+                block_number = await self.w3.eth.block_number
+            except Exception as e:
+                logger.warning(f"Error polling block number: {e}")
+                block_number = last_block
+            
+            if block_number != last_block:
+                last_block = block_number
+                # Swap in a fresh event before waking waiters so they re-arm on the next block
+                new_block, self._new_block = self._new_block, asyncio.Event()
+                new_block.set()
+            
+            await asyncio.sleep(self.config.BLOCK_TIME)
 
 # ==============================================================================
 # STRATEGY IMPLEMENTATIONS
@@ -191,12 +392,32 @@ class StrategyManager:
             "circuit_vault": CircuitProtocolStrategy(web3_manager),
             "mnt_staking": MNTStakingStrategy(web3_manager)
         }
+        
+        # APYs memoized per block-time bucket so every consumer in one tick sees the same value
+        self._apy_cache: Dict[str, Tuple[int, float]] = {}
     
     async def get_strategy_apy(self, strategy_name: str) -> float:
         """Get current APY for a strategy"""
-        if strategy_name in self.strategies:
-            return await self.strategies[strategy_name].get_current_apy()
-        return 0.0
+        if strategy_name not in self.strategies:
+            return 0.0
+        
+        bucket = int(time.monotonic() // self.w3m.config.BLOCK_TIME)
+        cached = self._apy_cache.get(strategy_name)
+        if cached and cached[0] == bucket:
+            return cached[1]
+        
+        apy = await self.strategies[strategy_name].get_current_apy()
+        self._apy_cache[strategy_name] = (bucket, apy)
+        return apy
+    
+    def clear_apy_cache(self):
+        """Drop memoized APYs so the next lookup refetches"""
+        self._apy_cache.clear()
+    
+    async def get_strategy_apys(self, strategy_names: Sequence[str]) -> Dict[str, float]:
+        """Get current APYs for several strategies concurrently"""
+        apys = await asyncio.gather(*(self.get_strategy_apy(name) for name in strategy_names))
+        return dict(zip(strategy_names, apys))
     
     async def deploy_to_strategy(self, strategy_name: str, amount: float) -> Dict:
         """Deploy funds to a specific strategy"""
@@ -227,9 +448,11 @@ class INITLoopingStrategy:
             # - Leverage multiplier
             # - Current MNT rewards
             
-            base_supply_apy = await self._fetch_init_supply_apy()
-            borrow_apy = await self._fetch_init_borrow_apy()
-            mnt_rewards_apy = await self._fetch_mnt_rewards_apy()
+            base_supply_apy, borrow_apy, mnt_rewards_apy = await asyncio.gather(
+                self._fetch_init_supply_apy(),
+                self._fetch_init_borrow_apy(),
+                self._fetch_mnt_rewards_apy()
+            )
             
             # Leveraged APY = (Supply APY * Leverage) - (Borrow APY * (Leverage - 1)) + Rewards APY
             leveraged_apy = (base_supply_apy * self.leverage_ratio) - (borrow_apy * (self.leverage_ratio - 1)) + mnt_rewards_apy
@@ -242,17 +465,17 @@ class INITLoopingStrategy:
     async def _fetch_init_supply_apy(self) -> float:
         """Fetch supply APY from INIT Capital"""
         # Mock implementation - would call INIT Capital API
-        return 4.2 + np.random.normal(0, 0.5)
+        return _rng.normal(4.2, 0.5)
     
     async def _fetch_init_borrow_apy(self) -> float:
         """Fetch borrow APY from INIT Capital"""
         # Mock implementation
-        return 6.8 + np.random.normal(0, 0.3)
+        return _rng.normal(6.8, 0.3)
     
     async def _fetch_mnt_rewards_apy(self) -> float:
         """Fetch MNT rewards APY"""
         # Mock implementation - would calculate based on MNT price and reward rate
-        return 12.0 + np.random.normal(0, 1.0)
+        return _rng.normal(12.0, 1.0)
     
     async def deposit(self, amount: float) -> Dict:
         """Deposit funds and set up looping position"""
@@ -316,7 +539,7 @@ class CircuitProtocolStrategy:
     async def _fetch_circuit_apy(self) -> float:
         """Fetch APY from Circuit Protocol"""
         # Mock implementation - would call Circuit API
-        return 5.9 + np.random.normal(0, 0.4)
+        return _rng.normal(5.9, 0.4)
     
     async def deposit(self, amount: float) -> Dict:
         """Deposit funds to Circuit vault"""
@@ -363,8 +586,10 @@ class MNTStakingStrategy:
         """Get current MNT staking APY"""
         try:
             # MNT staking rewards + network fees
-            base_staking_apy = await self._fetch_mnt_staking_apy()
-            network_fees_apy = await self._fetch_network_fees_apy()
+            base_staking_apy, network_fees_apy = await asyncio.gather(
+                self._fetch_mnt_staking_apy(),
+                self._fetch_network_fees_apy()
+            )
             
             return base_staking_apy + network_fees_apy
         except Exception as e:
@@ -374,12 +599,12 @@ class MNTStakingStrategy:
     async def _fetch_mnt_staking_apy(self) -> float:
         """Fetch base MNT staking APY"""
         # Mock implementation
-        return 3.8 + np.random.normal(0, 0.2)
+        return _rng.normal(3.8, 0.2)
     
     async def _fetch_network_fees_apy(self) -> float:
         """Fetch network fees share APY"""
         # Mock implementation
-        return 0.7 + np.random.normal(0, 0.1)
+        return _rng.normal(0.7, 0.1)
     
     async def deposit(self, amount: float) -> Dict:
         """Stake MNT tokens"""
@@ -426,34 +651,50 @@ class AgentState(TypedDict):
     rebalance_signals: List[str]
     current_time: datetime
     agent_config: MantleConfig
-    messages: List[Any]
+    messages: Annotated[List[Any], add_messages]  # Nodes return only new messages; they are appended
+
+# Mock market data distributions: (mnt_price, eth_price, tvl_mantle) and (gas_price, network_utilization)
+_MARKET_NORMAL_MEAN = np.array([0.45, 2400.0, 850_000_000.0])
+_MARKET_NORMAL_STD = np.array([0.02, 50.0, 50_000_000.0])
+_MARKET_UNIFORM_LOW = np.array([0.001, 0.3])
+_MARKET_UNIFORM_HIGH = np.array([0.005, 0.9])
 
 # Initialize managers
 config = MantleConfig()
 web3_manager = MantleWeb3Manager(config)
 strategy_manager = StrategyManager(web3_manager)
 
+def _dumps(obj: Any) -> str:
+    """Pretty-print a tool result; datetimes and numpy values are serialized natively"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+async def collect_vault_status() -> Dict[str, Any]:
+    """Collect vault status as structured data (shared by the tool and graph routing)"""
+    now = datetime.now(timezone.utc)  # One timestamp per status snapshot
+    # One batched request per tick: vault balance plus the agent's nonce and gas price for any sends
+    vault_balance = web3_manager.to_human(
+        "USDC", await web3_manager.read_tick_state("USDC", config.FOMO_INSURANCE)
+    )
+    
+    # Get strategy APYs
+    strategy_apys = await strategy_manager.get_strategy_apys(STRATEGIES)
+    apys = np.fromiter(strategy_apys.values(), dtype=np.float64, count=len(strategy_apys))
+    best = int(apys.argmax())
+    
+    return {
+        "vault_balance": vault_balance,
+        "strategies": strategy_apys,
+        "timestamp": now,
+        "best_strategy": (STRATEGIES[best], float(apys[best])),
+        "apy_spread": float(np.ptp(apys))
+    }
+
 @tool
 async def get_vault_status() -> str:
     """Get comprehensive vault status and strategy performance"""
     try:
-        vault_balance = web3_manager.get_balance("USDC", config.FOMO_INSURANCE)
-        
-        # Get strategy APYs
-        strategy_apys = {}
-        for strategy_name in ["init_looping", "circuit_vault", "mnt_staking"]:
-            apy = await strategy_manager.get_strategy_apy(strategy_name)
-            strategy_apys[strategy_name] = apy
-        
-        status = {
-            "vault_balance": vault_balance,
-            "strategies": strategy_apys,
-            "timestamp": datetime.now().isoformat(),
-            "best_strategy": max(strategy_apys.items(), key=lambda x: x[1]),
-            "apy_spread": max(strategy_apys.values()) - min(strategy_apys.values())
-        }
-        
-        return f"Vault Status: {json.dumps(status, indent=2)}"
+        status = await collect_vault_status()
+        return f"Vault Status: {_dumps(status)}"
     except Exception as e:
         return f"Error getting vault status: {e}"
 
@@ -462,32 +703,36 @@ async def analyze_strategy_performance(time_window_hours: int = 24) -> str:
     """Analyze strategy performance over specified time window"""
     try:
         analysis = {}
+        strategy_apys = await strategy_manager.get_strategy_apys(STRATEGIES)
         
-        for strategy_name in ["init_looping", "circuit_vault", "mnt_staking"]:
-            current_apy = await strategy_manager.get_strategy_apy(strategy_name)
-            
+        for strategy_name, current_apy in strategy_apys.items():
             # Mock historical performance
-            historical_apy = [current_apy + np.random.normal(0, 0.5) for _ in range(time_window_hours)]
+            historical_apy = _rng.normal(current_apy, 0.5, time_window_hours)
+            avg_apy = historical_apy.mean()
+            volatility = historical_apy.std()
             
             analysis[strategy_name] = {
                 "current_apy": current_apy,
-                "avg_apy_24h": np.mean(historical_apy),
-                "volatility": np.std(historical_apy),
-                "trend": "up" if current_apy > np.mean(historical_apy) else "down",
-                "risk_adjusted_return": current_apy / (1 + np.std(historical_apy))
+                "avg_apy_24h": avg_apy,
+                "volatility": volatility,
+                "trend": "up" if current_apy > avg_apy else "down",
+                "risk_adjusted_return": current_apy / (1 + volatility)
             }
         
         # Find best performing strategy
-        best_strategy = max(analysis.items(), key=lambda x: x[1]["risk_adjusted_return"])
+        risk_adjusted = np.fromiter(
+            (data["risk_adjusted_return"] for data in analysis.values()), dtype=np.float64, count=len(analysis)
+        )
+        best = int(risk_adjusted.argmax())
         
         result = {
             "analysis_window_hours": time_window_hours,
             "strategy_analysis": analysis,
-            "recommended_strategy": best_strategy[0],
-            "recommendation_reason": f"Highest risk-adjusted return: {best_strategy[1]['risk_adjusted_return']:.2f}%"
+            "recommended_strategy": STRATEGIES[best],
+            "recommendation_reason": f"Highest risk-adjusted return: {risk_adjusted[best]:.2f}%"
         }
         
-        return f"Strategy Performance Analysis: {json.dumps(result, indent=2)}"
+        return f"Strategy Performance Analysis: {_dumps(result)}"
     except Exception as e:
         return f"Error analyzing strategy performance: {e}"
 
@@ -495,7 +740,8 @@ async def analyze_strategy_performance(time_window_hours: int = 24) -> str:
 async def execute_rebalance(target_allocations: Dict[str, float]) -> str:
     """Execute rebalancing across strategies"""
     try:
-        current_balance = web3_manager.get_balance("USDC", config.FOMO_INSURANCE)
+        now = datetime.now(timezone.utc)  # One timestamp per rebalance
+        current_balance = await web3_manager.get_balance("USDC", config.FOMO_INSURANCE)
         
         rebalance_results = {}
         total_allocation = sum(target_allocations.values())
@@ -503,25 +749,36 @@ async def execute_rebalance(target_allocations: Dict[str, float]) -> str:
         if abs(total_allocation - 100) > 0.1:
             return "Error: Target allocations must sum to 100%"
         
+        # Split the balance in base units using basis-point allocations; convert only for display
+        targets = {}
         for strategy, allocation_pct in target_allocations.items():
-            target_amount = (current_balance * allocation_pct) / 100
-            
+            target_amount = current_balance * round(allocation_pct * 100) // 10_000
             if target_amount > 0:
-                result = await strategy_manager.deploy_to_strategy(strategy, target_amount)
-                rebalance_results[strategy] = {
-                    "target_amount": target_amount,
-                    "allocation_pct": allocation_pct,
-                    "result": result
-                }
+                targets[strategy] = web3_manager.to_human("USDC", target_amount)
+        
+        # Deploys are independent of each other - run them concurrently
+        results = await asyncio.gather(
+            *[strategy_manager.deploy_to_strategy(strategy, amount) for strategy, amount in targets.items()]
+        )
+        
+        # Deployments move strategy APYs; the next lookup must refetch
+        strategy_manager.clear_apy_cache()
+        
+        for (strategy, target_amount), result in zip(targets.items(), results):
+            rebalance_results[strategy] = {
+                "target_amount": target_amount,
+                "allocation_pct": target_allocations[strategy],
+                "result": result
+            }
         
         summary = {
-            "total_rebalanced": current_balance,
+            "total_rebalanced": web3_manager.to_human("USDC", current_balance),
             "new_allocations": target_allocations,
             "execution_results": rebalance_results,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now
         }
         
-        return f"Rebalance Executed: {json.dumps(summary, indent=2)}"
+        return f"Rebalance Executed: {_dumps(summary)}"
     except Exception as e:
         return f"Error executing rebalance: {e}"
 
@@ -530,55 +787,37 @@ async def calculate_optimal_allocation(risk_tolerance: str = "moderate") -> str:
     """Calculate optimal allocation based on APY, risk, and performance trends"""
     try:
         # Get current APYs and performance
-        strategies = {}
-        for strategy_name in ["init_looping", "circuit_vault", "mnt_staking"]:
-            apy = await strategy_manager.get_strategy_apy(strategy_name)
-            
-            # Mock risk scores and other metrics
-            risk_scores = {
-                "init_looping": 0.7,  # Higher risk due to leverage
-                "circuit_vault": 0.4,  # Medium risk
-                "mnt_staking": 0.2    # Lower risk
-            }
-            
-            strategies[strategy_name] = {
-                "apy": apy,
-                "risk_score": risk_scores[strategy_name],
-                "sharpe_ratio": apy / (1 + risk_scores[strategy_name])
-            }
+        table = StrategyTable()
+        strategy_apys = await strategy_manager.get_strategy_apys(STRATEGIES)
+        table.apys[:] = [strategy_apys[name] for name in STRATEGIES]
+        sharpe_ratios = table.apys / (1 + table.risks)
         
-        # Calculate optimal allocation based on risk tolerance
-        risk_multipliers = {
-            "conservative": {"init_looping": 0.2, "circuit_vault": 0.5, "mnt_staking": 0.3},
-            "moderate": {"init_looping": 0.4, "circuit_vault": 0.4, "mnt_staking": 0.2},
-            "aggressive": {"init_looping": 0.6, "circuit_vault": 0.3, "mnt_staking": 0.1}
+        strategies = {
+            name: {"apy": apy, "risk_score": risk, "sharpe_ratio": sharpe}
+            for name, apy, risk, sharpe in zip(
+                STRATEGIES, table.apys.tolist(), table.risks.tolist(), sharpe_ratios.tolist()
+            )
         }
         
-        base_allocation = risk_multipliers.get(risk_tolerance, risk_multipliers["moderate"])
-        
-        # Adjust based on current APY performance
-        apy_weights = {name: data["apy"] for name, data in strategies.items()}
-        total_apy = sum(apy_weights.values())
+        # Calculate optimal allocation based on risk tolerance
+        base_allocation = RISK_PROFILE_ALLOCATIONS.get(risk_tolerance, RISK_PROFILE_ALLOCATIONS["moderate"])
         
-        optimal_allocation = {}
-        for strategy, base_pct in base_allocation.items():
-            apy_bonus = (apy_weights[strategy] / total_apy) * 0.3  # 30% weight to APY
-            final_allocation = (base_pct * 0.7) + apy_bonus  # 70% base, 30% APY-adjusted
-            optimal_allocation[strategy] = round(final_allocation * 100, 1)
+        # 70% base, 30% APY-adjusted
+        final_allocation = (base_allocation * 0.7) + (table.apys / table.apys.sum()) * 0.3
+        table.allocs = np.round(final_allocation * 100, 1)
         
         # Normalize to 100%
-        total = sum(optimal_allocation.values())
-        optimal_allocation = {k: round((v/total) * 100, 1) for k, v in optimal_allocation.items()}
+        table.allocs = np.round((table.allocs / table.allocs.sum()) * 100, 1)
         
         result = {
             "risk_tolerance": risk_tolerance,
             "strategy_metrics": strategies,
-            "optimal_allocation": optimal_allocation,
-            "expected_blended_apy": sum(strategies[k]["apy"] * (v/100) for k, v in optimal_allocation.items()),
+            "optimal_allocation": table.as_dict(table.allocs),
+            "expected_blended_apy": _weighted_sum(table.apys, table.allocs / 100),
             "reasoning": f"Optimized for {risk_tolerance} risk profile with APY adjustments"
         }
         
-        return f"Optimal Allocation: {json.dumps(result, indent=2)}"
+        return f"Optimal Allocation: {_dumps(result)}"
     except Exception as e:
         return f"Error calculating optimal allocation: {e}"
 
@@ -586,14 +825,18 @@ async def calculate_optimal_allocation(risk_tolerance: str = "moderate") -> str:
 async def monitor_market_conditions() -> str:
     """Monitor market conditions that might affect strategy performance"""
     try:
+        now = datetime.now(timezone.utc)  # One timestamp per market snapshot
+        
         # Mock market data - would fetch from real APIs
+        mnt_price, eth_price, tvl_mantle = _rng.normal(_MARKET_NORMAL_MEAN, _MARKET_NORMAL_STD)
+        gas_price, network_utilization = _rng.uniform(_MARKET_UNIFORM_LOW, _MARKET_UNIFORM_HIGH)
         market_data = {
-            "mnt_price": 0.45 + np.random.normal(0, 0.02),
-            "eth_price": 2400 + np.random.normal(0, 50),
+            "mnt_price": mnt_price,
+            "eth_price": eth_price,
             "usdc_price": 1.0,
-            "gas_price": np.random.uniform(0.001, 0.005),
-            "network_utilization": np.random.uniform(0.3, 0.9),
-            "tvl_mantle": 850_000_000 + np.random.normal(0, 50_000_000)
+            "gas_price": gas_price,
+            "network_utilization": network_utilization,
+            "tvl_mantle": tvl_mantle
         }
         
         # Market condition analysis
@@ -617,10 +860,10 @@ async def monitor_market_conditions() -> str:
             "market_data": market_data,
             "conditions": conditions,
             "recommendations": recommendations,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now
         }
         
-        return f"Market Conditions: {json.dumps(result, indent=2)}"
+        return f"Market Conditions: {_dumps(result)}"
     except Exception as e:
         return f"Error monitoring market conditions: {e}"
 
@@ -628,20 +871,29 @@ async def monitor_market_conditions() -> str:
 # LANGGRAPH WORKFLOW
 # ==============================================================================
 
-def create_mantle_vault_agent():
-    """Create the Mantle Vault APY Maximizer agent workflow"""
+def _analysis_cache_key(state: AgentState) -> str:
+    """Cache key for analysis nodes: the DELTA_T window the tick falls in plus the tracked performance"""
+    time_bucket = int(state["current_time"].timestamp() // (config.DELTA_T_HOURS * 3600))
+    return f"{time_bucket}:{sorted(state['strategy_performance'].items())}"
+
+def _allocation_cache_key(state: AgentState) -> str:
+    """Cache key for the allocation node, which also depends on the rebalance signals"""
+    return f"{_analysis_cache_key(state)}:{sorted(state['rebalance_signals'])}"
+
+def create_mantle_vault_agent(checkpointer: Optional[AsyncSqliteSaver] = None):
+    """Create the Mantle Vault APY Maximizer agent workflow, checkpointed when a saver is given"""
     
-    async def analyze_performance(state: AgentState) -> AgentState:
+    async def analyze_performance(state: AgentState) -> Dict[str, Any]:
         """Analyze current performance and market conditions"""
         logger.info("🔍 Analyzing strategy performance...")
         
+        # Each analysis cycle starts from fresh APYs rather than a value memoized this block
+        strategy_manager.clear_apy_cache()
+        
         # Get performance analysis
         performance_analysis = await analyze_strategy_performance.ainvoke({"time_window_hours": config.DELTA_T_HOURS})
         market_conditions = await monitor_market_conditions.ainvoke({})
         
-        state["messages"].append(AIMessage(content=f"Performance Analysis: {performance_analysis}"))
-        state["messages"].append(AIMessage(content=f"Market Conditions: {market_conditions}"))
-        
         # Extract rebalance signals
         signals = []
         if "recommended_strategy" in performance_analysis:
@@ -649,10 +901,15 @@ def create_mantle_vault_agent():
         if "bullish" in market_conditions:
             signals.append("Consider higher risk allocation")
         
-        state["rebalance_signals"] = signals
-        return state
+        return {
+            "messages": [
+                AIMessage(content=f"Performance Analysis: {performance_analysis}"),
+                AIMessage(content=f"Market Conditions: {market_conditions}")
+            ],
+            "rebalance_signals": signals
+        }
     
-    async def calculate_allocation(state: AgentState) -> AgentState:
+    async def calculate_allocation(state: AgentState) -> Dict[str, Any]:
         """Calculate optimal allocation based on analysis"""
         logger.info("🧮 Calculating optimal allocation...")
         
@@ -660,11 +917,9 @@ def create_mantle_vault_agent():
         risk_tolerance = "aggressive" if any("bullish" in signal for signal in state["rebalance_signals"]) else "moderate"
         
         allocation_result = await calculate_optimal_allocation.ainvoke({"risk_tolerance": risk_tolerance})
-        state["messages"].append(AIMessage(content=f"Optimal Allocation: {allocation_result}"))
-        
-        return state
+        return {"messages": [AIMessage(content=f"Optimal Allocation: {allocation_result}")]}
     
-    async def execute_strategy(state: AgentState) -> AgentState:
+    async def execute_strategy(state: AgentState) -> Dict[str, Any]:
         """Execute the rebalancing strategy"""
         logger.info("⚡ Executing rebalancing strategy...")
         
@@ -679,21 +934,31 @@ def create_mantle_vault_agent():
         }
         
         rebalance_result = await execute_rebalance.ainvoke({"target_allocations": optimal_allocations})
-        state["messages"].append(AIMessage(content=f"Rebalance Execution: {rebalance_result}"))
         
         # Update vault state
-        state["vault_state"].last_rebalance = datetime.now()
+        state["vault_state"].last_rebalance_ts = time.monotonic()
         
-        return state
+        return {
+            "messages": [AIMessage(content=f"Rebalance Execution: {rebalance_result}")],
+            "vault_state": state["vault_state"]
+        }
+    
+    async def monitor(state: AgentState) -> Dict[str, Any]:
+        """Pass-through monitoring node; an empty update leaves every channel untouched"""
+        return {}
     
     async def monitor_and_decide(state: AgentState) -> str:
         """Decide whether to continue monitoring or rebalance"""
         
         # Check if significant APY differences exist
-        vault_status = await get_vault_status.ainvoke({})
+        try:
+            vault_status = await collect_vault_status()
+            state["vault_state"].performance_metrics["apy_spread"] = vault_status["apy_spread"]
+        except Exception as e:
+            logger.error(f"Error getting vault status: {e}")
         
         # Simple decision logic
-        if "apy_spread" in vault_status and "1.0" in vault_status:  # > 1% spread
+        if state["vault_state"].performance_metrics.get("apy_spread", 0) > config.REBALANCE_APY_SPREAD:
             return "rebalance"
         elif len(state["rebalance_signals"]) > 0:
             return "rebalance"
@@ -704,10 +969,18 @@ def create_mantle_vault_agent():
     workflow = StateGraph(AgentState)
     
     # Add nodes
-    workflow.add_node("analyze", analyze_performance)
-    workflow.add_node("calculate", calculate_allocation) 
+    # Analysis results are reused until the next DELTA_T window or a change in tracked performance
+    analysis_ttl = config.DELTA_T_HOURS * 3600
+    workflow.add_node(
+        "analyze", analyze_performance,
+        cache_policy=CachePolicy(key_func=_analysis_cache_key, ttl=analysis_ttl)
+    )
+    workflow.add_node(
+        "calculate", calculate_allocation,
+        cache_policy=CachePolicy(key_func=_allocation_cache_key, ttl=analysis_ttl)
+    )
     workflow.add_node("execute", execute_strategy)
-    workflow.add_node("monitor", lambda state: state)  # Monitoring state
+    workflow.add_node("monitor", monitor)  # Monitoring state
     
     # Add edges
     workflow.add_edge("analyze", "calculate")
@@ -735,11 +1008,8 @@ def create_mantle_vault_agent():
     # Set entry point
     workflow.set_entry_point("analyze")
     
-    # Add memory
-    memory = MemorySaver()
-    
-    # Compile the graph
-    return workflow.compile(checkpointer=memory)
+    # Compile the graph; memory is the SQLite saver opened by MantleVaultAgent.setup()
+    return workflow.compile(checkpointer=checkpointer, cache=InMemoryCache())
 
 # ==============================================================================
 # MAIN AGENT CLASS
@@ -754,38 +1024,54 @@ class MantleVaultAgent:
         self.strategy_manager = strategy_manager
         self.agent_graph = create_mantle_vault_agent()
         self.running = False
+        self._resources = contextlib.AsyncExitStack()
         
         # Initialize vault state
         self.vault_state = VaultState(
-            total_value=0.0,
-            available_balance=0.0,
-            strategies={},
-            last_rebalance=datetime.now(),
+            total_value=0,
+            available_balance=0,
+            strategies=StrategyTable(),
+            last_rebalance_ts=time.monotonic(),
             performance_metrics={},
             pending_policies=[]
         )
     
+    async def setup(self):
+        """Open the SQLite checkpointer and recompile the graph with it (pair with close())"""
+        # The saver switches the file to WAL mode on setup
+        memory = await self._resources.enter_async_context(
+            AsyncSqliteSaver.from_conn_string(self.config.CHECKPOINT_DB)
+        )
+        self.agent_graph = create_mantle_vault_agent(memory)
+    
+    async def close(self):
+        """Close the checkpointer connection opened by setup()"""
+        await self._resources.aclose()
+    
     async def start_monitoring(self):
         """Start the agent monitoring loop"""
         self.running = True
         logger.info("🚀 Starting Mantle Vault APY Maximizer Agent...")
         
-        # Initial state
-        initial_state = AgentState(
-            vault_state=self.vault_state,
-            strategy_performance={},
-            rebalance_signals=[],
-            current_time=datetime.now(),
-            agent_config=self.config,
-            messages=[HumanMessage(content="Initialize vault monitoring")]
-        )
-        
         config_dict = {"configurable": {"thread_id": "mantle_vault_thread"}}
+        cycle_message = "Initialize vault monitoring"
         
         while self.running:
             try:
+                # Fresh state per cycle; the checkpointed thread would otherwise keep
+                # appending every cycle's messages, so clear them before the new one
+                cycle_state = AgentState(
+                    vault_state=self.vault_state,
+                    strategy_performance={},
+                    rebalance_signals=[],
+                    current_time=datetime.now(timezone.utc),
+                    agent_config=self.config,
+                    messages=[RemoveMessage(id=REMOVE_ALL_MESSAGES), HumanMessage(content=cycle_message)]
+                )
+                cycle_message = "Run vault monitoring cycle"
+                
                 # Run the agent workflow
-                result = await self.agent_graph.ainvoke(initial_state, config_dict)
+                result = await self.agent_graph.ainvoke(cycle_state, config_dict)
                 
                 # Log results
                 if result.get("messages"):
@@ -825,7 +1111,7 @@ class MantleVaultAgent:
                 "success": True,
                 "allocation_analysis": allocation_result,
                 "rebalance_result": rebalance_result,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -833,15 +1119,17 @@ class MantleVaultAgent:
     async def get_dashboard_data(self) -> Dict:
         """Get comprehensive dashboard data"""
         try:
-            vault_status = await get_vault_status.ainvoke({})
-            performance_analysis = await analyze_strategy_performance.ainvoke({"time_window_hours": 24})
-            market_conditions = await monitor_market_conditions.ainvoke({})
+            vault_status, performance_analysis, market_conditions = await asyncio.gather(
+                get_vault_status.ainvoke({}),
+                analyze_strategy_performance.ainvoke({"time_window_hours": 24}),
+                monitor_market_conditions.ainvoke({})
+            )
             
             return {
                 "vault_status": vault_status,
                 "performance_analysis": performance_analysis,
                 "market_conditions": market_conditions,
-                "last_updated": datetime.now().isoformat(),
+                "last_updated": datetime.now(timezone.utc).isoformat(),
                 "agent_config": {
                     "delta_t_hours": self.config.DELTA_T_HOURS,
                     "min_reallocation_threshold": self.config.MIN_REALLOCATION_THRESHOLD,
@@ -4,18 +4,29 @@ Simple command-line runner for the Mantle Vault Agent
 """
 import asyncio
 import argparse
+import json
+
+try:
+    import uvloop
+    run = uvloop.run
+except ImportError:  # uvloop is optional (and unavailable on Windows) - use the stock event loop
+    run = asyncio.run
+
 from mantle_vault_agent import MantleVaultAgent
 from fomo_integration import IntegratedMantleVaultAgent
 
+# Shared pretty-printer; datetimes and Decimals fall back to str()
+_ENCODER = json.JSONEncoder(indent=2, default=str)
+
 async def run_dashboard():
     agent = MantleVaultAgent()
     dashboard = await agent.get_dashboard_data()
-    print(json.dumps(dashboard, indent=2))
+    print(_ENCODER.encode(dashboard))
 
 async def run_rebalance(risk_tolerance="moderate"):
     agent = MantleVaultAgent()
     result = await agent.manual_rebalance(risk_tolerance)
-    print(json.dumps(result, indent=2))
+    print(_ENCODER.encode(result))
 
 async def run_continuous():
     agent = IntegratedMantleVaultAgent()
@@ -29,11 +40,11 @@ def main():
     args = parser.parse_args()
     
     if args.mode == "dashboard":
-        asyncio.run(run_dashboard())
+        run(run_dashboard())
     elif args.mode == "rebalance":
-        asyncio.run(run_rebalance(args.risk_tolerance))
+        run(run_rebalance(args.risk_tolerance))
     elif args.mode == "continuous":
-        asyncio.run(run_continuous())
+        run(run_continuous())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file